@@ -0,0 +1,614 @@
+"""
+Lokale, asynchrone HTTP-Schnittstelle für das Prognoseformat.
+
+Der Dienst stellt Erfassung, Outcome-Setzung, Abfrage und Bewertung
+ohne Streamlit-Oberfläche bereit, damit andere Werkzeuge das Format
+maschinell nutzen können. Er kommt ohne externe Abhängigkeiten aus
+(nur asyncio aus der Standardbibliothek).
+
+Endpunkte:
+- POST /forecasts                   neue Prognose (RiskForecast.create)
+- POST /forecasts/batch             mehrere Prognosen (Batch-Validierung, alles oder nichts)
+- POST /forecasts/{id}/outcome      Ereignisausgang setzen (einmalig, nach
+                                    Horizontende; sonst 409)
+- GET  /forecasts                   Prognosen abfragen (gestreamtes JSON)
+- GET  /forecasts/{id}              einzelne Prognose
+- GET  /scores                      mittlerer und aggregierter Brier Score
+                                    (optional Stichtag ?as_of=…)
+- GET  /scores/forecasts            Einzel-Scores (gestreamtes JSON)
+
+Start:
+    python api.py --port 8000 [--data-file forecasts.json]
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import storage
+from models import RiskForecast
+from schema import SchemaValidationError, validate_inputs
+from scoring import AsOfIndex, aggregate_brier_scores, iter_evaluations, mean_brier_score
+from storage import apply_outcome, forecast_to_dict, load_forecasts
+
+
+# Schreib-Batching: Aufträge werden gesammelt und gemeinsam persistiert
+DEFAULT_BATCH_WINDOW = 0.005   # Sekunden
+DEFAULT_MAX_BATCH = 500
+
+# Anzahl Datensätze pro gestreamtem Chunk
+STREAM_CHUNK_SIZE = 500
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+_FILTER_FIELDS = ("author", "team", "forecast_type", "outcome_class", "comparison_level")
+
+_STATUS_TEXT = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    411: "Length Required",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class ApiError(Exception):
+    """Fehler, der als HTTP-Antwort an den Client zurückgegeben wird."""
+
+    def __init__(self, status: int, message: str, details: Any = None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.details = details
+
+
+class _StreamAborted(Exception):
+    """Fehler nach gesendetem Antwortkopf; die Verbindung wird geschlossen."""
+
+
+async def _run_blocking(fn: Callable[..., Any], *args: Any) -> Any:
+    """
+    Führt rechenintensive Arbeit (Bewertung, Indexaufbau) im Executor
+    aus, damit die Event-Loop weitere Verbindungen bedienen kann.
+    """
+    return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+
+# --------------------------------
+# Payload-Verarbeitung
+# --------------------------------
+
+def forecast_from_payload(payload: Any) -> RiskForecast:
+    """
+    Erzeugt eine neue Prognose aus einem JSON-Payload.
+
+    Die Eingabe wird gegen das Erfassungsschema (schema.ForecastInput)
+    geprüft und anschließend über RiskForecast.create angelegt, damit
+    API und GUI identische Regeln anwenden.
+    """
+    return validate_inputs([payload])[0]
+
+
+def _matches(forecast: RiskForecast, filters: Dict[str, str]) -> bool:
+    for name, value in filters.items():
+        if name == "evaluated":
+            if (forecast.outcome is not None) != (value.lower() in ("1", "true", "ja")):
+                return False
+        elif getattr(forecast, name, None) != value:
+            return False
+    return True
+
+
+# --------------------------------
+# Dienst mit Schreib-Batching
+# --------------------------------
+
+@dataclass
+class _WriteOp:
+    kind: str  # "create" | "outcome"
+    payload: Any
+    future: asyncio.Future = field(repr=False)
+
+
+class ForecastService:
+    """
+    Kapselt Lese- und Schreibzugriffe auf den persistenten Speicher.
+
+    Schreibaufträge werden in einer Warteschlange gesammelt und je
+    Batch mit genau einem Lese-/Schreibvorgang der JSON-Datei
+    persistiert. Lesezugriffe nutzen einen Cache, der über
+    storage.data_version() invalidiert wird.
+    """
+
+    def __init__(
+        self,
+        *,
+        batch_window: float = DEFAULT_BATCH_WINDOW,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ):
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self._queue: "asyncio.Queue[_WriteOp]" = asyncio.Queue()
+        self._cache: List[RiskForecast] = []
+        self._cache_index: Dict[str, RiskForecast] = {}
+        self._cache_version: Any = object()
+        self._as_of_index: Optional[AsOfIndex] = None
+        self._as_of_source: Optional[List[RiskForecast]] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+
+    # ---------- Lebenszyklus ----------
+
+    def start(self) -> None:
+        if self._writer_task is None:
+            self._writer_task = asyncio.get_running_loop().create_task(self._writer())
+
+    async def stop(self) -> None:
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+
+    # ---------- Lesen ----------
+
+    def _refresh(self) -> None:
+        with self._lock:
+            self._refresh_locked()
+
+    def _refresh_locked(self) -> None:
+        version = storage.data_version()
+        if version != self._cache_version:
+            self._cache = load_forecasts(strict=True)
+            self._cache_index = {f.forecast_id: f for f in self._cache}
+            self._cache_version = version
+
+    async def snapshot(self) -> List[RiskForecast]:
+        await asyncio.get_running_loop().run_in_executor(None, self._refresh)
+        return self._cache
+
+    async def as_of_index(self) -> AsOfIndex:
+        """Stichtagsindex des aktuellen Bestands (je Datenstand gecacht)."""
+        forecasts = await self.snapshot()
+        if self._as_of_source is not forecasts:
+            self._as_of_index = await _run_blocking(AsOfIndex, forecasts)
+            self._as_of_source = forecasts
+        return self._as_of_index
+
+    async def get(self, forecast_id: str) -> Optional[RiskForecast]:
+        await self.snapshot()
+        return self._cache_index.get(forecast_id)
+
+    # ---------- Schreiben ----------
+
+    async def submit(self, kind: str, payload: Any) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_WriteOp(kind, payload, future))
+        return await future
+
+    async def _writer(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            ops = [await self._queue.get()]
+            await asyncio.sleep(self.batch_window)
+            while len(ops) < self.max_batch and not self._queue.empty():
+                ops.append(self._queue.get_nowait())
+
+            try:
+                results = await loop.run_in_executor(None, self._flush, ops)
+            except Exception as exc:  # Persistenzfehler an alle Aufrufer melden
+                for op in ops:
+                    if not op.future.done():
+                        op.future.set_exception(exc)
+                continue
+
+            for op, result in zip(ops, results):
+                if op.future.done():
+                    continue
+                if isinstance(result, ApiError):  # Ablehnung eines Einzelauftrags
+                    op.future.set_exception(result)
+                else:
+                    op.future.set_result(result)
+
+    def _flush(self, ops: List[_WriteOp]) -> List[Any]:
+        """
+        Wendet alle Aufträge eines Batches auf den aktuellen Datenbestand
+        an und speichert ihn einmalig. Läuft in einem Worker-Thread.
+        """
+        with self._lock:
+            return self._flush_locked(ops)
+
+    def _flush_locked(self, ops: List[_WriteOp]) -> List[Any]:
+        self._refresh_locked()
+        forecasts = list(self._cache)
+        index = dict(self._cache_index)
+        positions: Optional[Dict[str, int]] = None
+        now = datetime.utcnow()
+        results: List[Any] = []
+
+        for op in ops:
+            if op.kind == "create":
+                forecasts.extend(op.payload)
+                for f in op.payload:
+                    index[f.forecast_id] = f
+                results.append(op.payload)
+            elif op.kind == "outcome":
+                forecast_id, outcome = op.payload
+                target = index.get(forecast_id)
+                if target is None:
+                    results.append(None)
+                elif target.outcome is not None:
+                    results.append(ApiError(409, "Outcome ist bereits erfasst."))
+                elif target.forecast_horizon_end >= now:
+                    results.append(ApiError(409, "Prognosehorizont ist noch nicht abgelaufen."))
+                else:
+                    # Kopie statt In-place-Änderung: gecachte Objekte werden
+                    # ggf. gerade von _json_array serialisiert
+                    updated = apply_outcome(replace(target), outcome)
+                    if positions is None:
+                        positions = {f.forecast_id: i for i, f in enumerate(forecasts)}
+                    forecasts[positions[forecast_id]] = updated
+                    index[forecast_id] = updated
+                    results.append(updated)
+            else:
+                raise ValueError(f"Unbekannter Auftragstyp: {op.kind}")
+
+        if all(isinstance(result, ApiError) or result is None for result in results):
+            return results  # nichts zu speichern
+
+        try:
+            version = storage.save_all_forecasts(
+                forecasts, reason=",".join(sorted({op.kind for op in ops}))
+            )
+        except Exception:
+            # Datei ggf. teilweise geschrieben -> beim nächsten Zugriff neu laden
+            self._cache_version = object()
+            raise
+        self._cache = forecasts
+        self._cache_index = index
+        self._cache_version = version
+        return results
+
+
+# --------------------------------
+# HTTP-Protokoll
+# --------------------------------
+
+async def _read_request(
+    reader: asyncio.StreamReader,
+) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, target, _version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise ApiError(400, "Ungültige Anfragezeile.")
+
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding", "identity").lower() != "identity":
+        # Chunked-Bodies werden nicht gelesen; ohne Ablehnung würden ihre
+        # Bytes als nächste Anfrage interpretiert
+        raise ApiError(411, "Transfer-Encoding wird nicht unterstützt, Content-Length erforderlich.")
+
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise ApiError(400, "Ungültiger Content-Length-Header.")
+    if length < 0:
+        raise ApiError(400, "Ungültiger Content-Length-Header.")
+    if length > MAX_BODY_BYTES:
+        raise ApiError(413, "Anfrage zu groß.")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, headers, body
+
+
+def _head(status: int, extra: Iterable[Tuple[str, str]]) -> bytes:
+    lines = [f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, 'Unknown')}"]
+    lines.extend(f"{name}: {value}" for name, value in extra)
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def _send_json(writer: asyncio.StreamWriter, status: int, payload: Any) -> None:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    writer.write(_head(status, [
+        ("Content-Type", "application/json; charset=utf-8"),
+        ("Content-Length", str(len(body))),
+    ]) + body)
+    await writer.drain()
+
+
+async def _send_stream(
+    writer: asyncio.StreamWriter,
+    chunks: AsyncIterator[bytes],
+) -> None:
+    writer.write(_head(200, [
+        ("Content-Type", "application/json; charset=utf-8"),
+        ("Transfer-Encoding", "chunked"),
+    ]))
+    try:
+        async for chunk in chunks:
+            if chunk:
+                writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                await writer.drain()
+    except ConnectionError:
+        raise
+    except Exception as exc:
+        # Status ist bereits gesendet: ohne abschließenden Chunk erkennt
+        # der Client die unvollständige Antwort am Verbindungsende
+        raise _StreamAborted() from exc
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+
+async def _json_array(items: Iterable[Any]) -> AsyncIterator[bytes]:
+    """
+    Serialisiert eine Sequenz abschnittsweise als JSON-Array, sodass
+    große Ergebnismengen nicht vollständig im Speicher kodiert werden.
+
+    items wird im Executor abschnittsweise weitergeführt und kodiert;
+    ein Generator (z. B. iter_evaluations) wird so erst beim Streamen
+    und ohne Blockieren der Event-Loop ausgewertet.
+    """
+    iterator = iter(items)
+
+    def next_chunk() -> str:
+        return ",".join(
+            json.dumps(item, ensure_ascii=False)
+            for item in islice(iterator, STREAM_CHUNK_SIZE)
+        )
+
+    yield b"["
+    first = True
+    while True:
+        chunk = await _run_blocking(next_chunk)
+        if not chunk:
+            break
+        yield (("" if first else ",") + chunk).encode("utf-8")
+        first = False
+    yield b"]"
+
+
+def _error_details(exc: SchemaValidationError) -> List[Dict[str, Any]]:
+    return [error.to_dict() for error in exc.errors]
+
+
+def _decode_body(body: bytes) -> Any:
+    try:
+        return json.loads(body or b"null")
+    except json.JSONDecodeError as exc:
+        raise ApiError(400, f"Ungültiges JSON: {exc}")
+
+
+# --------------------------------
+# Routing
+# --------------------------------
+
+async def _dispatch(
+    service: ForecastService,
+    writer: asyncio.StreamWriter,
+    method: str,
+    target: str,
+    body: bytes,
+) -> None:
+    url = urlsplit(target)
+    parts = [p for p in url.path.split("/") if p]
+    query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+    if parts == ["forecasts"]:
+        if method == "POST":
+            try:
+                forecast = forecast_from_payload(_decode_body(body))
+            except SchemaValidationError as exc:
+                raise ApiError(400, "Prognose verletzt das Schema.", _error_details(exc))
+            except ValueError as exc:
+                raise ApiError(400, str(exc))
+            await service.submit("create", [forecast])
+            await _send_json(writer, 201, forecast_to_dict(forecast))
+            return
+        if method == "GET":
+            filters = {
+                k: v for k, v in query.items()
+                if k in _FILTER_FIELDS or k == "evaluated"
+            }
+            forecasts = await service.snapshot()
+            await _send_stream(writer, _json_array(
+                forecast_to_dict(f) for f in forecasts if _matches(f, filters)
+            ))
+            return
+        raise ApiError(405, "Methode nicht erlaubt.")
+
+    if parts == ["forecasts", "batch"]:
+        if method != "POST":
+            raise ApiError(405, "Methode nicht erlaubt.")
+        payload = _decode_body(body)
+        if isinstance(payload, dict):
+            payload = payload.get("forecasts")
+        if not isinstance(payload, list):
+            raise ApiError(400, "Erwartet wird eine Liste von Prognosen.")
+
+        try:
+            forecasts = validate_inputs(payload)
+        except SchemaValidationError as exc:
+            raise ApiError(400, "Batch enthält ungültige Prognosen.", _error_details(exc))
+        except ValueError as exc:
+            raise ApiError(400, str(exc))
+
+        await service.submit("create", forecasts)
+        await _send_json(writer, 201, [forecast_to_dict(f) for f in forecasts])
+        return
+
+    if len(parts) == 2 and parts[0] == "forecasts":
+        if method != "GET":
+            raise ApiError(405, "Methode nicht erlaubt.")
+        forecast = await service.get(parts[1])
+        if forecast is None:
+            raise ApiError(404, "Prognose nicht gefunden.")
+        await _send_json(writer, 200, forecast_to_dict(forecast))
+        return
+
+    if len(parts) == 3 and parts[0] == "forecasts" and parts[2] == "outcome":
+        if method != "POST":
+            raise ApiError(405, "Methode nicht erlaubt.")
+        payload = _decode_body(body)
+        outcome = payload.get("outcome") if isinstance(payload, dict) else None
+        if outcome not in (0, 1) or isinstance(outcome, bool):
+            raise ApiError(400, "outcome muss 0 oder 1 sein.")
+        updated = await service.submit("outcome", (parts[1], outcome))
+        if updated is None:
+            raise ApiError(404, "Prognose nicht gefunden.")
+        await _send_json(writer, 200, forecast_to_dict(updated))
+        return
+
+    if parts == ["scores"]:
+        if method != "GET":
+            raise ApiError(405, "Methode nicht erlaubt.")
+        by = query.get("by", "author")
+        if by not in ("author", "team"):
+            raise ApiError(400, "by muss 'author' oder 'team' sein.")
+        if "as_of" in query:
+            try:
+                as_of = datetime.fromisoformat(query["as_of"])
+            except ValueError:
+                raise ApiError(400, "as_of ist kein gültiger ISO-8601-Zeitpunkt.")
+            if as_of.tzinfo is not None:
+                # gespeicherte Zeitpunkte sind naiv in UTC
+                as_of = as_of.astimezone(timezone.utc).replace(tzinfo=None)
+            index = await service.as_of_index()
+            mean, aggregate = await _run_blocking(lambda: (
+                index.mean_brier_score(as_of),
+                index.aggregate_brier_scores(as_of, by=by),
+            ))
+            await _send_json(writer, 200, {
+                "as_of": as_of.isoformat(),
+                "mean_brier_score": mean,
+                "by": by,
+                "aggregate": aggregate,
+            })
+            return
+
+        forecasts = await service.snapshot()
+        mean, aggregate = await _run_blocking(lambda: (
+            mean_brier_score(forecasts),
+            aggregate_brier_scores(forecasts, by=by),
+        ))
+        await _send_json(writer, 200, {
+            "mean_brier_score": mean,
+            "by": by,
+            "aggregate": aggregate,
+        })
+        return
+
+    if parts == ["scores", "forecasts"]:
+        if method != "GET":
+            raise ApiError(405, "Methode nicht erlaubt.")
+        forecasts = await service.snapshot()
+        await _send_stream(writer, _json_array(iter_evaluations(forecasts)))
+        return
+
+    raise ApiError(404, "Unbekannter Endpunkt.")
+
+
+async def handle_connection(
+    service: ForecastService,
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+    """Bedient eine (ggf. Keep-Alive-)Verbindung bis zu deren Ende."""
+    try:
+        while True:
+            try:
+                request = await _read_request(reader)
+            except ApiError as exc:
+                await _send_json(writer, exc.status, {"error": exc.message})
+                break
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            if request is None:
+                break
+
+            method, target, headers, body = request
+            try:
+                await _dispatch(service, writer, method, target, body)
+            except ApiError as exc:
+                payload = {"error": exc.message}
+                if exc.details is not None:
+                    payload["details"] = exc.details
+                await _send_json(writer, exc.status, payload)
+            except (ConnectionError, _StreamAborted):
+                break
+            except Exception as exc:
+                await _send_json(writer, 500, {"error": str(exc)})
+
+            if headers.get("connection", "").lower() == "close":
+                break
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def start_server(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    **service_options: Any,
+) -> Tuple[asyncio.AbstractServer, ForecastService]:
+    """
+    Startet den HTTP-Dienst in der laufenden Event-Loop.
+    """
+    service = ForecastService(**service_options)
+    service.start()
+    server = await asyncio.start_server(
+        lambda r, w: handle_connection(service, r, w), host, port
+    )
+    return server, service
+
+
+async def serve(host: str, port: int) -> None:
+    server, service = await start_server(host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Lokale HTTP-API für Risiko-Prognosen")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--data-file", type=Path, default=storage.DATA_FILE)
+    args = parser.parse_args()
+
+    storage.DATA_FILE = args.data_file
+    print(f"API läuft auf http://{args.host}:{args.port} (Daten: {args.data_file})")
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
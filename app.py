@@ -1,11 +1,14 @@
 import streamlit as st
+from streamlit.errors import StreamlitAPIException
 from datetime import datetime, date
 
 from models import RiskForecast
-from storage import load_forecasts, save_forecast, save_all_forecasts
-from scoring import aggregate_brier_scores, is_brier_applicable, brier_score
+from app_state import SharedState
 from classification import classify_forecast
 
+# Anzahl der Prognosen je Seite in der Übersicht
+PAGE_SIZE = 50
+
 # --------------------------------
 # Seiteneinstellungen
 # --------------------------------
@@ -24,6 +27,18 @@ st.info(
     "sondern aus strukturierten Vorfragen abgeleitet."
 )
 
+# --------------------------------
+# Datenbestand (versioniert, sitzungsübergreifend gecacht, app_state.py)
+# --------------------------------
+
+@st.cache_resource
+def _shared_state() -> SharedState:
+    return SharedState()
+
+
+shared = _shared_state()
+
+
 # --------------------------------
 # Neue Prognose
 # --------------------------------
@@ -153,7 +168,7 @@ with st.form("create_forecast", clear_on_submit=True):
                 threshold_definition=threshold_definition
             )
 
-            save_forecast(forecast)
+            shared.create_forecast(forecast)
             st.success("Prognose gespeichert.")
 
 st.divider()
@@ -164,11 +179,37 @@ st.divider()
 
 st.header("Gespeicherte Prognosen")
 
-forecasts = load_forecasts()
-now = datetime.utcnow()
 
-for f in forecasts:
-    with st.expander(f"Prognose: {f.forecast_name or f.forecast_id}"):
+def render_aggregates(slot) -> None:
+    """
+    Schreibt die aggregierte Auswertung in ihren Platzhalter; wird auch
+    aus einer Prognosekarte (Fragment) heraus aufgerufen.
+    """
+    scores_author = shared.aggregate_scores()
+    with slot.container():
+        if not scores_author:
+            st.info("Noch keine aggregierbaren Prognosen.")
+        else:
+            for author, score in scores_author.items():
+                st.write(f"- **{author}**: {score:.3f}")
+
+
+@st.fragment
+def forecast_card(forecast_id: str, aggregates_slot) -> None:
+    """
+    Darstellung und Outcome-Erfassung einer Prognose.
+
+    Als Fragment ausgeführt: Interaktionen (Auswahl und Speichern des
+    Outcomes) führen nur diese Karte erneut aus, nicht die gesamte
+    Anwendung; nach dem Speichern wird zusätzlich die aggregierte
+    Auswertung aktualisiert.
+    """
+    state = shared.get_state()
+    f = state["forecasts"][state["index"][forecast_id]]
+    now = datetime.utcnow()
+
+    with st.expander(f"Prognose: {f.forecast_name or f.forecast_id}",
+                     expanded=f"flash_{forecast_id}" in st.session_state):
 
         st.write(f"**Prognosetyp:** {f.forecast_type}")
         st.write(f"**Outcome-Klasse:** {f.outcome_class}")
@@ -180,6 +221,11 @@ for f in forecasts:
         )
         st.write(f"**Wahrscheinlichkeit:** {f.probability}")
 
+        if f"flash_{forecast_id}" in st.session_state:
+            st.success(st.session_state.pop(f"flash_{forecast_id}"))
+            # Outcome soeben gespeichert: Aggregation mit aktualisieren
+            render_aggregates(aggregates_slot)
+
         if f.outcome is None and f.forecast_horizon_end < now:
             outcome = st.radio(
                 "Ist das Ereignis eingetreten?",
@@ -189,20 +235,41 @@ for f in forecasts:
             )
 
             if st.button("Outcome speichern", key=f"save_{f.forecast_id}"):
-                f.outcome = outcome
-                f.evaluation_timestamp = datetime.utcnow()
-                f.comparison_level = "E3"
-                save_all_forecasts(forecasts)
-                st.success("Outcome gespeichert – Prognose ist nun bewertbar.")
-
-        if is_brier_applicable(f):
-            st.write(
-                f"**Brier Score:** "
-                f"{brier_score(f.probability, f.outcome):.3f}"
-            )
+                saved = shared.set_outcome(f.forecast_id, outcome)
+                st.session_state[f"flash_{forecast_id}"] = (
+                    "Outcome gespeichert – Prognose ist nun bewertbar."
+                    if saved else "Outcome wurde bereits erfasst."
+                )
+                # nur diese Karte (und die Aggregation) neu darstellen;
+                # außerhalb eines Fragment-Laufs (z. B. streamlit.testing)
+                # ist nur ein vollständiger Lauf möglich
+                try:
+                    st.rerun(scope="fragment")
+                except StreamlitAPIException:
+                    st.rerun()
+
+        score = state["scores"][f.forecast_id]
+        if score is not None:
+            st.write(f"**Brier Score:** {score:.3f}")
         else:
             st.info("Diese Prognose ist (noch) nicht quantitativ bewertbar.")
 
+
+state = shared.get_state()
+
+page_count = max(1, -(-len(state["forecasts"]) // PAGE_SIZE))
+page = st.number_input(
+    f"Seite (von {page_count})",
+    min_value=1,
+    max_value=page_count,
+    value=1,
+    step=1,
+)
+
+# Karten vor der Auswertung, deren Platzhalter aber bereits anlegen,
+# damit eine Karte ihn nach dem Speichern aktualisieren kann
+cards = st.container()
+
 st.divider()
 
 # --------------------------------
@@ -210,10 +277,10 @@ st.divider()
 # --------------------------------
 
 st.header("Aggregierte Auswertung (Demonstration)")
+aggregates_slot = st.empty()
+
+with cards:
+    for f in state["forecasts"][(page - 1) * PAGE_SIZE:page * PAGE_SIZE]:
+        forecast_card(f.forecast_id, aggregates_slot)
 
-scores_author = aggregate_brier_scores(forecasts, by="author")
-if not scores_author:
-    st.info("Noch keine aggregierbaren Prognosen.")
-else:
-    for author, score in scores_author.items():
-        st.write(f"- **{author}**: {score:.3f}")
+render_aggregates(aggregates_slot)
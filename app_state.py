@@ -0,0 +1,167 @@
+"""
+Gemeinsamer, versionierter Datenbestand der Oberfläche (app.py).
+
+Prognosen, Einzel-Scores und Mittelwerte je Autor werden einmal je
+Prozess gehalten und von allen Sitzungen geteilt; app.py legt die
+Instanz über st.cache_resource an, der Lasttest
+(benchmarks/loadtest_storage.py) verwendet dieselbe Klasse direkt.
+Neu geladen wird nur, wenn sich die Datei geändert hat
+(storage.data_version). Eigene Schreibvorgänge aktualisieren den Cache
+gezielt, sodass eine Interaktion nicht den gesamten Bestand neu lädt
+oder neu bewertet. Sitzungen laufen in eigenen Threads; Änderungen am
+gemeinsamen Stand erfolgen daher unter einer Sperre.
+"""
+
+import threading
+from dataclasses import replace
+from typing import Dict, List, Optional, Set
+
+from models import RiskForecast
+from storage import apply_outcome, data_version, load_forecasts, save_all_forecasts
+from scoring import is_brier_applicable, brier_score
+
+
+def _score(forecast: RiskForecast) -> Optional[float]:
+    if not is_brier_applicable(forecast):
+        return None
+    return brier_score(forecast.probability, forecast.outcome)
+
+
+def _scored_author(forecast: RiskForecast, score: Optional[float]) -> Optional[str]:
+    author = forecast.author
+    if score is None or not isinstance(author, str) or not author.strip():
+        return None
+    return author
+
+
+def _update_mean(state: dict, author: Optional[str]) -> None:
+    """
+    Berechnet den mittleren Brier Score eines Autors aus den gecachten
+    Einzel-Scores neu (in Bestandsreihenfolge, wie
+    scoring.aggregate_brier_scores).
+    """
+    if author is None:
+        return
+    positions = state["authored"].get(author)
+    if not positions:
+        state["authored"].pop(author, None)
+        state["means"].pop(author, None)
+        return
+    ordered = sorted(positions)
+    forecasts, scores = state["forecasts"], state["scores"]
+    values = [scores[forecasts[p].forecast_id] for p in ordered]
+    state["means"][author] = (ordered[0], sum(values) / len(values))
+
+
+def _build_state(version) -> dict:
+    forecasts = load_forecasts()
+    scores = {f.forecast_id: _score(f) for f in forecasts}
+    authored: Dict[str, Set[int]] = {}
+    for position, f in enumerate(forecasts):
+        author = _scored_author(f, scores[f.forecast_id])
+        if author is not None:
+            authored.setdefault(author, set()).add(position)
+
+    state = {
+        "version": version,
+        "forecasts": forecasts,
+        "index": {f.forecast_id: i for i, f in enumerate(forecasts)},
+        "scores": scores,
+        # Positionen der bewerteten Prognosen je Autor
+        "authored": authored,
+        # Autor -> (erste Position, mittlerer Brier Score)
+        "means": {},
+    }
+    for author in authored:
+        _update_mean(state, author)
+    return state
+
+
+def _put_forecast(state: dict, forecast: RiskForecast) -> None:
+    """
+    Übernimmt eine neue oder geänderte Prognose in den Cache und
+    berechnet die Mittelwerte der betroffenen Autoren neu.
+    """
+    forecast_id = forecast.forecast_id
+    position = state["index"].get(forecast_id)
+    previous_author = None
+
+    if position is None:
+        position = len(state["forecasts"])
+        state["index"][forecast_id] = position
+        state["forecasts"].append(forecast)
+    else:
+        previous = state["forecasts"][position]
+        previous_author = _scored_author(previous, state["scores"][forecast_id])
+        if previous_author is not None:
+            state["authored"][previous_author].discard(position)
+        state["forecasts"][position] = forecast
+
+    state["scores"][forecast_id] = _score(forecast)
+    author = _scored_author(forecast, state["scores"][forecast_id])
+    if author is not None:
+        state["authored"].setdefault(author, set()).add(position)
+
+    _update_mean(state, previous_author)
+    if author != previous_author:
+        _update_mean(state, author)
+
+
+class SharedState:
+    """Gemeinsamer Datenbestand aller Sitzungen eines Prozesses."""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.data: Optional[dict] = None
+
+    def get_state(self) -> dict:
+        with self.lock:
+            version = data_version()
+            if self.data is None or self.data["version"] != version:
+                self.data = _build_state(version)
+            return self.data
+
+    def write(self, changed: List[RiskForecast], reason: str) -> None:
+        """
+        Speichert neue bzw. geänderte Prognosen auf Basis des gecachten
+        Bestands (ohne erneutes Laden der Datei) und übernimmt sie in den
+        Cache. Hat zwischenzeitlich ein anderer Prozess geschrieben, wird
+        zuvor neu geladen.
+        """
+        with self.lock:
+            state = self.get_state()
+            forecasts = list(state["forecasts"])
+            for forecast in changed:
+                position = state["index"].get(forecast.forecast_id)
+                if position is None:
+                    forecasts.append(forecast)
+                else:
+                    forecasts[position] = forecast
+            version = save_all_forecasts(forecasts, reason=reason)
+
+            for forecast in changed:
+                _put_forecast(state, forecast)
+            state["version"] = version
+
+    def create_forecast(self, forecast: RiskForecast) -> None:
+        self.write([forecast], reason="create")
+
+    def set_outcome(self, forecast_id: str, outcome: int) -> bool:
+        """Setzt das Outcome, sofern noch keines erfasst ist."""
+        with self.lock:
+            state = self.get_state()
+            current = state["forecasts"][state["index"][forecast_id]]
+            if current.outcome is not None:  # z. B. in anderer Sitzung gesetzt
+                return False
+            # Kopie: andere Sitzungen lesen den gemeinsamen Stand parallel
+            self.write([apply_outcome(replace(current), outcome)], reason="outcome")
+            return True
+
+    def aggregate_scores(self) -> Dict[str, float]:
+        """Mittlerer Brier Score je Autor (Reihenfolge des ersten Auftretens)."""
+        with self.lock:
+            means = self.get_state()["means"]
+            return {
+                author: mean
+                for author, (_, mean) in sorted(means.items(), key=lambda item: item[1][0])
+            }
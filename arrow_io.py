@@ -0,0 +1,250 @@
+"""
+Spaltenorientierter Export und Import des Prognosebestands
+(Apache Arrow IPC und Parquet) für Analysen, z. B. in Notebooks.
+
+Dateien werden batchweise (RecordBatches) geschrieben und gelesen;
+export_forecasts und iter_forecasts benötigen daher nur Speicher für
+einen Batch. export_dataset und import_dataset arbeiten dagegen auf dem
+gespeicherten Bestand, den storage.py als ein JSON-Dokument vollständig
+liest und schreibt; ihr Speicherbedarf wächst mit der Bestandsgröße.
+Prognosetyp, Outcome-Klasse und Vergleichsebene werden als
+Dictionary-Spalten mit festem Wörterbuch (PT/O/E-Literale) abgelegt.
+Zusätzlich enthält der Export die Bewertung aus scoring.py
+(brier_applicable, brier_score); beim Import werden diese berechneten
+Spalten ignoriert und alle Zeilen batchweise gegen das Prognoseschema
+(schema.py) validiert.
+"""
+
+from dataclasses import fields, replace
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Literal
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from columnar import COMPARISON_LEVELS, FORECAST_TYPES, OUTCOME_CLASSES
+from models import RiskForecast
+from schema import SCHEMA_VERSION, SchemaValidationError, validate_records
+from scoring import brier_score, is_brier_applicable
+from storage import load_forecasts, save_all_forecasts
+
+
+DEFAULT_BATCH_SIZE = 65_536
+
+Format = Literal["arrow", "parquet"]
+
+# Feste Wörterbücher der kategorialen Spalten
+CATEGORIES = {
+    "forecast_type": FORECAST_TYPES,
+    "outcome_class": OUTCOME_CLASSES,
+    "comparison_level": COMPARISON_LEVELS,
+}
+
+_CATEGORY = pa.dictionary(pa.int8(), pa.string())
+_TIMESTAMP = pa.timestamp("us")
+
+ARROW_SCHEMA = pa.schema(
+    [
+        ("forecast_id", pa.string()),
+        ("forecast_name", pa.string()),
+        ("author", pa.string()),
+        ("team", pa.string()),
+        ("forecast_type", _CATEGORY),
+        ("outcome_class", _CATEGORY),
+        ("comparison_level", _CATEGORY),
+        ("event_description", pa.string()),
+        ("event_criteria", pa.string()),
+        ("forecast_timestamp", _TIMESTAMP),
+        ("forecast_horizon_start", _TIMESTAMP),
+        ("forecast_horizon_end", _TIMESTAMP),
+        ("probability", pa.float64()),
+        ("rationale", pa.string()),
+        ("normalization_applied", pa.bool_()),
+        ("normalization_assumption", pa.string()),
+        ("threshold_definition", pa.string()),
+        ("outcome", pa.int8()),
+        ("evaluation_timestamp", _TIMESTAMP),
+        # berechnet (scoring.py)
+        ("brier_applicable", pa.bool_()),
+        ("brier_score", pa.float64()),
+    ],
+    metadata={"schema_version": SCHEMA_VERSION},
+)
+
+COMPUTED_COLUMNS = ("brier_applicable", "brier_score")
+
+_MODEL_FIELDS = tuple(f.name for f in fields(RiskForecast))
+
+
+def _batches(forecasts: Iterable[RiskForecast], size: int) -> Iterator[List[RiskForecast]]:
+    iterator = iter(forecasts)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def to_record_batch(forecasts: List[RiskForecast]) -> pa.RecordBatch:
+    """Wandelt Prognosen in einen RecordBatch gemäß ARROW_SCHEMA um."""
+    arrays = []
+    for column in ARROW_SCHEMA:
+        name = column.name
+        if name == "brier_applicable":
+            values = [is_brier_applicable(f) for f in forecasts]
+        elif name == "brier_score":
+            values = [
+                brier_score(f.probability, f.outcome) if is_brier_applicable(f) else None
+                for f in forecasts
+            ]
+        else:
+            values = [getattr(f, name) for f in forecasts]
+
+        if name in CATEGORIES:
+            categories = CATEGORIES[name]
+            arrays.append(pa.DictionaryArray.from_arrays(
+                pa.array([categories.index(v) for v in values], type=pa.int8()),
+                pa.array(categories, type=pa.string()),
+            ))
+        else:
+            arrays.append(pa.array(values, type=column.type))
+
+    return pa.RecordBatch.from_arrays(arrays, schema=ARROW_SCHEMA)
+
+
+def _batch_records(batch: pa.RecordBatch) -> List[dict]:
+    columns = {
+        name: batch.column(name).to_pylist()
+        for name in _MODEL_FIELDS
+    }
+    return [
+        {name: columns[name][row] for name in _MODEL_FIELDS}
+        for row in range(batch.num_rows)
+    ]
+
+
+def from_record_batch(batch: pa.RecordBatch) -> List[RiskForecast]:
+    """Rekonstruiert Prognosen aus einem RecordBatch (ohne Validierung)."""
+    return [RiskForecast(**record) for record in _batch_records(batch)]
+
+
+def validate_record_batch(batch: pa.RecordBatch, offset: int = 0) -> List[RiskForecast]:
+    """
+    Rekonstruiert Prognosen aus einem RecordBatch und validiert sie gegen
+    das Prognoseschema. Fehlerindizes beziehen sich auf die Zeile in der
+    Datei (offset = Anzahl vorheriger Zeilen).
+    """
+    try:
+        return validate_records(_batch_records(batch))
+    except SchemaValidationError as exc:
+        raise SchemaValidationError([
+            error if error.index is None else replace(error, index=error.index + offset)
+            for error in exc.errors
+        ]) from None
+
+
+# --------------------------------
+# Export
+# --------------------------------
+
+def export_forecasts(
+    path: Path,
+    forecasts: Iterable[RiskForecast],
+    *,
+    format: Format = "parquet",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """
+    Schreibt Prognosen batchweise als Arrow-IPC- oder Parquet-Datei und
+    liefert die Anzahl geschriebener Zeilen.
+    """
+    rows = 0
+    if format == "arrow":
+        with pa.OSFile(str(path), "wb") as sink, \
+                pa.ipc.new_file(sink, ARROW_SCHEMA) as writer:
+            for batch in _batches(forecasts, batch_size):
+                writer.write_batch(to_record_batch(batch))
+                rows += len(batch)
+    elif format == "parquet":
+        with pq.ParquetWriter(str(path), ARROW_SCHEMA) as writer:
+            for batch in _batches(forecasts, batch_size):
+                # je Batch eine Row Group
+                writer.write_table(pa.Table.from_batches([to_record_batch(batch)]))
+                rows += len(batch)
+    else:
+        raise ValueError(f"Unbekanntes Format: {format}")
+    return rows
+
+
+# --------------------------------
+# Import
+# --------------------------------
+
+def iter_record_batches(
+    path: Path,
+    *,
+    format: Format = "parquet",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[pa.RecordBatch]:
+    """
+    Liest eine exportierte Datei batchweise (Arrow IPC per Memory-Map).
+    """
+    if format == "arrow":
+        with pa.memory_map(str(path), "r") as source:
+            reader = pa.ipc.open_file(source)
+            for index in range(reader.num_record_batches):
+                yield reader.get_batch(index)
+    elif format == "parquet":
+        parquet_file = pq.ParquetFile(str(path))
+        yield from parquet_file.iter_batches(batch_size=batch_size)
+    else:
+        raise ValueError(f"Unbekanntes Format: {format}")
+
+
+def iter_forecasts(
+    path: Path,
+    *,
+    format: Format = "parquet",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[RiskForecast]:
+    """Liest Prognosen aus einer exportierten Datei (batchweise)."""
+    for batch in iter_record_batches(path, format=format, batch_size=batch_size):
+        yield from from_record_batch(batch)
+
+
+def export_dataset(path: Path, *, format: Format = "parquet") -> int:
+    """
+    Exportiert den vollständigen gespeicherten Bestand (hält ihn dafür
+    vollständig im Speicher, siehe Moduldokumentation).
+    """
+    return export_forecasts(path, load_forecasts(), format=format)
+
+
+def import_dataset(path: Path, *, format: Format = "parquet") -> int:
+    """
+    Übernimmt den Inhalt einer exportierten Datei in den gespeicherten
+    Bestand und liefert die Anzahl importierter Zeilen.
+
+    Zusammengeführt wird über die forecast_id: vorhandene Prognosen
+    werden ersetzt, neue angehängt, nicht enthaltene bleiben unverändert.
+    Kommt eine forecast_id mehrfach vor, gilt die letzte Zeile. Änderungen
+    werden als Revisionen (reason="import") protokolliert.
+
+    Jeder Batch wird vor dem Speichern validiert; bei einer
+    SchemaValidationError bleibt der Bestand unverändert.
+    """
+    forecasts = load_forecasts()
+    positions = {f.forecast_id: i for i, f in enumerate(forecasts)}
+    rows = 0
+    for batch in iter_record_batches(path, format=format):
+        for forecast in validate_record_batch(batch, offset=rows):
+            position = positions.get(forecast.forecast_id)
+            if position is None:
+                positions[forecast.forecast_id] = len(forecasts)
+                forecasts.append(forecast)
+            else:
+                forecasts[position] = forecast
+        rows += batch.num_rows
+    save_all_forecasts(forecasts, reason="import")
+    return rows
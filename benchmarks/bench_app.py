@@ -0,0 +1,77 @@
+"""
+Interaktionslatenz der Streamlit-Anwendung auf einem großen Bestand.
+
+Gemessen werden mit streamlit.testing (ohne Browser):
+- erster Aufruf der Anwendung
+- Auswahl eines Outcomes in einer Prognose
+- Speichern des Outcomes
+- erster Aufruf einer zweiten, gleichzeitigen Sitzung
+
+Für einen Vorher/Nachher-Vergleich kann eine ältere Fassung der
+Anwendung übergeben werden, z. B.:
+    git show <commit>:app.py > /tmp/app_before.py
+    python -m benchmarks.bench_app --app /tmp/app_before.py
+
+Aufruf (aus dem Projektverzeichnis):
+    python -m benchmarks.bench_app --records 100000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+import storage
+from benchmarks.datasets import make_forecasts
+
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+def timed(label: str, action) -> None:
+    t0 = time.perf_counter()
+    at = action()
+    print(f"{label:<28} {(time.perf_counter() - t0) * 1000:>10.1f} ms")
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Interaktionslatenz der Streamlit-App")
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--app", type=Path, default=PROJECT_DIR / "app.py")
+    parser.add_argument("--timeout", type=float, default=600)
+    args = parser.parse_args()
+
+    # Die Anwendung importiert die Projektmodule und nutzt forecasts.json
+    # im Arbeitsverzeichnis
+    sys.path.insert(0, str(PROJECT_DIR))
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        storage.DATA_FILE = Path(tmp) / "forecasts.json"
+        forecasts = make_forecasts(args.records)
+        storage.save_all_forecasts(forecasts)
+
+        # erste noch offene Prognose auf der ersten Seite
+        target = next(f for f in forecasts[:50] if f.outcome is None)
+
+        at = AppTest.from_file(str(args.app), default_timeout=args.timeout)
+        print(f"Datensätze: {args.records:,}, Anwendung: {args.app}\n")
+
+        timed("Erster Aufruf", at.run)
+        timed("Outcome auswählen", lambda: at.radio(key=f"outcome_{target.forecast_id}").set_value(1).run())
+        timed("Outcome speichern", lambda: at.button(key=f"save_{target.forecast_id}").click().run())
+        timed("Erneuter Aufruf", at.run)
+        second = AppTest.from_file(str(args.app), default_timeout=args.timeout)
+        timed("Zweite Sitzung", second.run)
+
+        saved = {f.forecast_id: f for f in storage.load_forecasts()}[target.forecast_id]
+        print(f"\nOutcome gespeichert: {'ja' if saved.outcome == 1 else 'NEIN'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Export/Import als Arrow IPC und Parquet im Vergleich zu forecasts.json.
+
+Gibt je Format Dateigröße, Schreib- und Lesezeit aus und prüft den
+verlustfreien Round-Trip gegen forecast_to_dict.
+
+Aufruf (aus dem Projektverzeichnis):
+    python -m benchmarks.bench_arrow --records 500000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import storage
+from arrow_io import export_forecasts, iter_forecasts
+from benchmarks.datasets import make_forecasts
+from storage import forecast_to_dict
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark des Arrow/Parquet-Exports")
+    parser.add_argument("--records", type=int, default=200_000)
+    args = parser.parse_args()
+
+    forecasts = make_forecasts(args.records)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        storage.DATA_FILE = tmp / "forecasts.json"
+
+        t0 = time.perf_counter()
+        storage.save_all_forecasts(forecasts)
+        t1 = time.perf_counter()
+        count = len(storage.load_forecasts())
+        t2 = time.perf_counter()
+        print(f"Datensätze: {count:,}\n")
+        print(f"{'Format':<8} {'Größe':>10} {'Schreiben':>11} {'Lesen':>10}  Round-Trip")
+        print(f"{'json':<8} {storage.DATA_FILE.stat().st_size / 1e6:>8.1f}MB "
+              f"{(t1 - t0) * 1000:>9.0f}ms {(t2 - t1) * 1000:>8.0f}ms  -")
+
+        for fmt, suffix in (("arrow", ".arrow"), ("parquet", ".parquet")):
+            path = tmp / f"forecasts{suffix}"
+            t0 = time.perf_counter()
+            export_forecasts(path, forecasts, format=fmt)
+            t1 = time.perf_counter()
+            read = list(iter_forecasts(path, format=fmt))
+            t2 = time.perf_counter()
+
+            # verlustfreier Round-Trip: fehlende/überzählige und abweichende Zeilen
+            mismatches = abs(len(read) - len(forecasts)) + sum(
+                forecast_to_dict(a) != forecast_to_dict(b)
+                for a, b in zip(forecasts, read)
+            )
+            print(f"{fmt:<8} {path.stat().st_size / 1e6:>8.1f}MB "
+                  f"{(t1 - t0) * 1000:>9.0f}ms {(t2 - t1) * 1000:>8.0f}ms  "
+                  f"{'ok' if not mismatches else f'{mismatches} Abweichungen'}")
+
+
+if __name__ == "__main__":
+    main()
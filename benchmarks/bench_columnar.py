@@ -0,0 +1,67 @@
+"""
+Kaltstart-Latenz der Bewertung: JSON-Pfad vs. Spaltenspeicher.
+
+Verglichen werden
+- load_forecasts() + mean_brier_score / aggregate_brier_scores
+- load_columns() (numpy.memmap) + *_columns-Varianten
+
+Aufruf (aus dem Projektverzeichnis):
+    python -m benchmarks.bench_columnar --records 1000000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import storage
+from benchmarks.datasets import make_forecasts
+from scoring import (
+    aggregate_brier_scores,
+    aggregate_brier_scores_columns,
+    mean_brier_score,
+    mean_brier_score_columns,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark des Spaltenspeichers")
+    parser.add_argument("--records", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.DATA_FILE = Path(tmp) / "forecasts.json"
+        storage.save_all_forecasts(make_forecasts(args.records))
+        size = storage.DATA_FILE.stat().st_size
+        print(f"Datensätze: {args.records:,}, JSON: {size / 1e6:.1f} MB\n")
+
+        t0 = time.perf_counter()
+        forecasts = storage.load_forecasts()
+        t1 = time.perf_counter()
+        mean_json = mean_brier_score(forecasts)
+        by_author_json = aggregate_brier_scores(forecasts, by="author")
+        t2 = time.perf_counter()
+        del forecasts
+
+        t3 = time.perf_counter()
+        columns = storage.load_columns()
+        t4 = time.perf_counter()
+        mean_cols = mean_brier_score_columns(columns)
+        by_author_cols = aggregate_brier_scores_columns(columns, by="author")
+        t5 = time.perf_counter()
+
+        print(f"{'Pfad':<28} {'Laden':>10} {'Bewerten':>10} {'Gesamt':>10}")
+        print(f"{'JSON + Objekte':<28} {(t1 - t0) * 1000:>8.1f}ms {(t2 - t1) * 1000:>8.1f}ms "
+              f"{(t2 - t0) * 1000:>8.1f}ms")
+        print(f"{'Spaltenspeicher (memmap)':<28} {(t4 - t3) * 1000:>8.1f}ms {(t5 - t4) * 1000:>8.1f}ms "
+              f"{(t5 - t3) * 1000:>8.1f}ms")
+
+        deviation = max(
+            abs(by_author_json[k] - by_author_cols[k]) for k in by_author_json
+        ) if by_author_json else 0.0
+        print(f"\nMittlerer Brier Score: {mean_json:.12f} (JSON) / {mean_cols:.12f} (Spalten)")
+        print(f"Max. Abweichung je Autor: {deviation:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Skalierung der parallelen Bewertung (parallel_scoring.py) von 1 bis N
+Worker-Prozessen.
+
+Für jede Worker-Anzahl werden Laufzeit, Speedup gegenüber einem Worker
+und die Bitgleichheit des Ergebnisses (float.hex) ausgegeben.
+
+Aufruf (aus dem Projektverzeichnis):
+    python -m benchmarks.bench_parallel --records 1000000 --max-workers 8
+"""
+
+import argparse
+import os
+import time
+
+from benchmarks.datasets import make_forecasts
+from parallel_scoring import DEFAULT_CHUNK_SIZE, parallel_evaluate
+from scoring import evaluate_forecasts
+
+
+def fingerprint(result) -> str:
+    parts = [result.mean().hex() if result.count else "-"]
+    for by in sorted(result.groups):
+        for key, group in result.groups[by].items():
+            parts.append(f"{by}:{key}:{group.total.hex()}:{group.count}")
+    return "|".join(parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Skalierung der parallelen Bewertung")
+    parser.add_argument("--records", type=int, default=500_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    forecasts = make_forecasts(args.records)
+    print(f"Datensätze: {args.records:,}, Chunkgröße: {args.chunk_size:,}\n")
+
+    t0 = time.perf_counter()
+    evaluate_forecasts(forecasts)
+    print(f"evaluate_forecasts (seriell): {(time.perf_counter() - t0) * 1000:.1f} ms\n")
+
+    worker_counts = sorted({1, *range(2, args.max_workers + 1, 2), args.max_workers})
+    baseline = reference = None
+
+    print(f"{'Worker':>6} {'Zeit':>10} {'Speedup':>8}  bitgleich")
+    for workers in worker_counts:
+        t0 = time.perf_counter()
+        result = parallel_evaluate(
+            forecasts,
+            by=("author", "team"),
+            workers=workers,
+            chunk_size=args.chunk_size,
+            include_scores=True,
+        )
+        elapsed = time.perf_counter() - t0
+
+        baseline = baseline or elapsed
+        fp = fingerprint(result)
+        reference = reference or fp
+        print(
+            f"{workers:>6} {elapsed * 1000:>8.1f}ms {baseline / elapsed:>7.2f}x  "
+            f"{'ja' if fp == reference else 'NEIN'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Durchsatzvergleich: bisheriger Pro-Datensatz-Pfad vs. kompilierte
+Batch-Validierung (schema.py).
+
+Verglichen werden
+- Laden:  json.loads + dict_to_forecast  vs.  schema.validate_json
+          (versionierte Datei sowie älteres Listenformat mit Migration)
+- Ingest: Einzelprüfung + RiskForecast.create  vs.  schema.validate_inputs
+
+Aufruf (aus dem Projektverzeichnis):
+    python -m benchmarks.bench_schema --records 100000
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from models import RiskForecast
+from schema import SCHEMA_VERSION, validate_inputs, validate_json
+from storage import dict_to_forecast, forecast_to_dict
+
+
+def make_inputs(n: int, seed: int = 0) -> List[dict]:
+    rng = random.Random(seed)
+    inputs = []
+    for i in range(n):
+        start = datetime(2024, 1, 1) + timedelta(days=rng.randrange(365))
+        inputs.append({
+            "forecast_type": rng.choice(["PT1", "PT2", "PT3", "PT4"]),
+            "outcome_class": rng.choice(["O1", "O2", "O3", "O4"]),
+            "event_description": f"Ereignis {i}",
+            "event_criteria": "Kriterium",
+            "forecast_horizon_start": start.isoformat(),
+            "forecast_horizon_end": (start + timedelta(days=180)).isoformat(),
+            "probability": rng.random(),
+            "author": f"analyst-{rng.randrange(50)}",
+            "team": f"team-{rng.randrange(5)}",
+        })
+    return inputs
+
+
+def create_per_record(inputs: List[dict]) -> List[RiskForecast]:
+    """Bisheriger Pfad: Zeitpunkte parsen und einzeln RiskForecast.create."""
+    forecasts = []
+    for item in inputs:
+        kwargs = dict(item)
+        kwargs["forecast_horizon_start"] = datetime.fromisoformat(kwargs["forecast_horizon_start"])
+        kwargs["forecast_horizon_end"] = datetime.fromisoformat(kwargs["forecast_horizon_end"])
+        forecasts.append(RiskForecast.create(**kwargs))
+    return forecasts
+
+
+def timed(label: str, n: int, fn: Callable[[], object], repeat: int) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    print(f"{label:<45} {best * 1000:>9.1f} ms  {n / best:>12,.0f} Datensätze/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark der Schema-Validierung")
+    parser.add_argument("--records", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    n = args.records
+    inputs = make_inputs(n)
+    records = [forecast_to_dict(f) for f in create_per_record(inputs)]
+    document = json.dumps(
+        {"schema_version": SCHEMA_VERSION, "forecasts": records}
+    ).encode("utf-8")
+    legacy = json.dumps(records).encode("utf-8")
+
+    print(f"Datensätze: {n:,}, Dateigröße: {len(document) / 1e6:.1f} MB\n")
+    print("Laden")
+    timed("json.loads + dict_to_forecast (ohne Schema)", n,
+          lambda: [dict_to_forecast(d) for d in json.loads(document)["forecasts"]],
+          args.repeat)
+    timed("schema.validate_json (strikt, Batch)", n,
+          lambda: validate_json(document), args.repeat)
+    timed("schema.validate_json (Listenformat, Migration)", n,
+          lambda: validate_json(legacy), args.repeat)
+    print("\nIngest")
+    timed("RiskForecast.create je Datensatz", n,
+          lambda: create_per_record(inputs), args.repeat)
+    timed("schema.validate_inputs (strikt, Batch)", n,
+          lambda: validate_inputs(inputs), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Synthetische Prognosebestände für Benchmarks und Lasttests.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import List
+
+from models import RiskForecast
+
+
+def make_forecasts(n: int, seed: int = 0) -> List[RiskForecast]:
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1)
+    forecasts = []
+    for i in range(n):
+        start = base + timedelta(days=rng.randrange(365))
+        evaluated = rng.random() < 0.7
+        forecasts.append(RiskForecast(
+            forecast_id=f"f-{i}",
+            forecast_timestamp=start - timedelta(days=1),
+            forecast_type=rng.choice(["PT1", "PT2", "PT3", "PT4"]),
+            event_description=f"Ereignis {i}",
+            event_criteria="Kriterium",
+            outcome_class=rng.choice(["O1", "O2", "O3", "O4"]),
+            forecast_horizon_start=start,
+            forecast_horizon_end=start + timedelta(days=180),
+            probability=rng.random(),
+            author=f"analyst-{rng.randrange(50)}",
+            team=f"team-{rng.randrange(5)}",
+            rationale="Begründung " * 10,
+            comparison_level="E3" if evaluated else "E1",
+            threshold_definition="≥ 3 Vorfälle" if rng.random() < 0.5 else None,
+            outcome=rng.randrange(2) if evaluated else None,
+            evaluation_timestamp=start + timedelta(days=200) if evaluated else None,
+        ))
+    return forecasts
@@ -0,0 +1,213 @@
+"""
+Lasttest für die lokale HTTP-API (api.py).
+
+Simuliert parallele Clients mit einer Mischung aus Einzel-Erfassung,
+Batch-Erfassung, Outcome-Setzung, Abfragen und Bewertungen und gibt
+Durchsatz sowie Latenz-Perzentile (p50/p99) je Operation aus.
+
+Ohne --url wird ein Server mit temporärer Datendatei im selben
+Prozess gestartet.
+
+Aufruf (aus dem Projektverzeichnis):
+    python -m benchmarks.loadtest_api --clients 32 --requests 200
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import storage
+from api import start_server
+
+
+OPERATION_MIX = {
+    "create": 0.4,
+    "batch": 0.05,
+    "outcome": 0.25,
+    "query": 0.1,
+    "scores": 0.2,
+}
+
+
+def _payload(rng: random.Random) -> dict:
+    start = datetime(2024, 1, 1) + timedelta(days=rng.randrange(365))
+    return {
+        "forecast_type": rng.choice(["PT1", "PT2", "PT3"]),
+        "outcome_class": rng.choice(["O1", "O2", "O3"]),
+        "event_description": "Lasttest-Ereignis",
+        "event_criteria": "Lasttest-Kriterium",
+        "forecast_horizon_start": start.isoformat(),
+        "forecast_horizon_end": (start + timedelta(days=90)).isoformat(),
+        "probability": round(rng.random(), 2),
+        "author": f"analyst-{rng.randrange(10)}",
+        "team": f"team-{rng.randrange(3)}",
+        "threshold_definition": "≥ 3 Vorfälle",
+    }
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(q * (len(ordered) - 1)))))
+    return ordered[rank]
+
+
+class Client:
+    """Minimaler HTTP/1.1-Client mit Keep-Alive-Verbindung."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self) -> None:
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+
+    async def request(self, method: str, path: str, payload=None) -> Tuple[int, bytes]:
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+            .encode("latin-1") + body
+        )
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        headers: Dict[str, str] = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding") == "chunked":
+            parts = []
+            while True:
+                size = int((await self.reader.readline()).strip(), 16)
+                chunk = await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                parts.append(chunk[:-2])
+            return status, b"".join(parts)
+
+        return status, await self.reader.readexactly(int(headers.get("content-length", 0)))
+
+
+async def run_client(
+    client: Client,
+    requests: int,
+    rng: random.Random,
+    created_ids: List[str],
+    latencies: Dict[str, List[float]],
+    errors: Dict[str, int],
+) -> None:
+    operations = list(OPERATION_MIX)
+    weights = list(OPERATION_MIX.values())
+
+    for _ in range(requests):
+        op = rng.choices(operations, weights)[0]
+        if op == "outcome" and not created_ids:
+            op = "create"
+
+        t0 = time.perf_counter()
+        if op == "create":
+            status, body = await client.request("POST", "/forecasts", _payload(rng))
+            if status == 201:
+                created_ids.append(json.loads(body)["forecast_id"])
+        elif op == "batch":
+            status, _ = await client.request(
+                "POST", "/forecasts/batch", [_payload(rng) for _ in range(20)]
+            )
+        elif op == "outcome":
+            # je Prognose nur ein Outcome (erneutes Setzen -> 409)
+            forecast_id = created_ids.pop(rng.randrange(len(created_ids)))
+            status, _ = await client.request(
+                "POST", f"/forecasts/{forecast_id}/outcome", {"outcome": rng.randrange(2)}
+            )
+        elif op == "query":
+            status, _ = await client.request("GET", f"/forecasts?author=analyst-{rng.randrange(10)}")
+        else:
+            status, _ = await client.request("GET", "/scores?by=author")
+        latencies[op].append(time.perf_counter() - t0)
+
+        if status >= 400:
+            errors[op] += 1
+
+
+async def run(url: Optional[str], clients: int, requests: int, seed: int) -> None:
+    server = service = None
+    if url is None:
+        tmp = tempfile.TemporaryDirectory()
+        storage.DATA_FILE = Path(tmp.name) / "forecasts.json"
+        server, service = await start_server("127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()[:2]
+    else:
+        parsed = urlsplit(url)
+        host, port = parsed.hostname, parsed.port or 80
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    created_ids: List[str] = []
+
+    pool = [Client(host, port) for _ in range(clients)]
+    await asyncio.gather(*(c.connect() for c in pool))
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(
+        run_client(c, requests, random.Random(seed + i), created_ids, latencies, errors)
+        for i, c in enumerate(pool)
+    ))
+    elapsed = time.perf_counter() - t0
+
+    await asyncio.gather(*(c.close() for c in pool))
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+        await service.stop()
+
+    total = sum(len(v) for v in latencies.values())
+    all_latencies = [x for v in latencies.values() for x in v]
+    print(f"Clients: {clients}, Anfragen: {total}, Dauer: {elapsed:.2f} s")
+    print(f"Durchsatz: {total / elapsed:.1f} Anfragen/s")
+    print(f"{'Operation':<10} {'Anzahl':>8} {'Fehler':>7} {'p50 ms':>9} {'p99 ms':>9}")
+    for op in OPERATION_MIX:
+        values = latencies.get(op, [])
+        print(
+            f"{op:<10} {len(values):>8} {errors.get(op, 0):>7} "
+            f"{percentile(values, 0.50) * 1000:>9.2f} {percentile(values, 0.99) * 1000:>9.2f}"
+        )
+    print(
+        f"{'gesamt':<10} {total:>8} {sum(errors.values()):>7} "
+        f"{percentile(all_latencies, 0.50) * 1000:>9.2f} "
+        f"{percentile(all_latencies, 0.99) * 1000:>9.2f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Lasttest der Prognose-API")
+    parser.add_argument("--url", help="laufender Server, z. B. http://127.0.0.1:8000")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=100, help="Anfragen je Client")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.clients, args.requests, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,420 @@
+"""
+Lasttest mit gleichzeitigen Nutzern für Speicher- und Bewertungspfade.
+
+Simuliert N gleichzeitige Analysten (Threads) mit einer konfigurierbaren
+Mischung aus Erfassung, Outcome-Setzung, Übersicht und Aggregation und
+berichtet Durchsatz, Latenz-Perzentile, Fehler, verlorene Änderungen
+(lost updates) und das Dateiwachstum.
+
+Ein Szenario wird aus einem Seed erzeugt und kann als JSON gespeichert
+und unverändert gegen jedes Backend erneut ausgeführt werden:
+
+- storage:  direkte Aufrufe von storage.py (wie mehrere App-Sitzungen
+            ohne Cache)
+- app:      Datenpfade von app.py (app_state.SharedState: gemeinsamer
+            Cache über data_version, Speichern auf Basis des Caches
+            unter einer Sperre)
+- columns:  wie storage, Aggregation über den Spaltenspeicher
+- api:      HTTP-API (api.py) mit Schreib-Batching
+
+Aufruf (aus dem Projektverzeichnis):
+    python -m benchmarks.loadtest_storage --users 16 --ops 50 \\
+        --mix create=0.3,outcome=0.2,list=0.3,aggregate=0.2 \\
+        --backends storage,app,columns,api --save-scenario szenario.json
+    python -m benchmarks.loadtest_storage --scenario szenario.json --backends api
+"""
+
+import argparse
+import asyncio
+import http.client
+import json
+import random
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+import storage
+from api import start_server
+from app_state import SharedState
+from benchmarks.loadtest_api import percentile
+from models import RiskForecast
+from scoring import aggregate_brier_scores, aggregate_brier_scores_columns
+
+
+DEFAULT_MIX = {"create": 0.3, "outcome": 0.2, "list": 0.3, "aggregate": 0.2}
+
+OPERATIONS = tuple(DEFAULT_MIX)
+
+
+# --------------------------------
+# Szenario
+# --------------------------------
+
+def seed_forecasts(n: int) -> List[RiskForecast]:
+    """Deterministischer Ausgangsbestand offener, abgelaufener Prognosen."""
+    start = datetime(2024, 1, 1)
+    return [
+        RiskForecast(
+            forecast_id=f"seed-{i}",
+            forecast_timestamp=start,
+            forecast_type="PT1",
+            event_description=f"Ausgangsprognose {i}",
+            event_criteria="Kriterium",
+            outcome_class="O1",
+            forecast_horizon_start=start,
+            forecast_horizon_end=start + timedelta(days=90),
+            probability=(i % 100) / 100,
+            author=f"analyst-{i % 10}",
+            team=f"team-{i % 3}",
+        )
+        for i in range(n)
+    ]
+
+
+def generate_scenario(
+    users: int,
+    ops_per_user: int,
+    mix: Dict[str, float],
+    seed: int,
+    seed_size: int,
+) -> dict:
+    rng = random.Random(seed)
+    # jede Ausgangsprognose erhält höchstens ein Outcome (die API lehnt
+    # erneutes Setzen mit 409 ab)
+    open_ids = list(range(seed_size))
+    rng.shuffle(open_ids)
+    operations = []
+    for user in range(users):
+        ops = []
+        for _ in range(ops_per_user):
+            op = rng.choices(list(mix), list(mix.values()))[0]
+            if op == "outcome" and not open_ids:
+                op = "list"
+            if op == "create":
+                start = datetime(2024, 1, 1) + timedelta(days=rng.randrange(365))
+                ops.append({"op": op, "payload": {
+                    "forecast_type": "PT1",
+                    "outcome_class": "O1",
+                    "event_description": f"Lasttest Nutzer {user}",
+                    "event_criteria": "Kriterium",
+                    "forecast_horizon_start": start.isoformat(),
+                    "forecast_horizon_end": (start + timedelta(days=90)).isoformat(),
+                    "probability": round(rng.random(), 2),
+                    "author": f"analyst-{user % 10}",
+                    "team": f"team-{user % 3}",
+                }})
+            elif op == "outcome":
+                ops.append({
+                    "op": op,
+                    "forecast_id": f"seed-{open_ids.pop()}",
+                    "outcome": rng.randrange(2),
+                })
+            else:
+                ops.append({"op": op})
+        operations.append(ops)
+
+    return {"seed": seed, "seed_size": seed_size, "mix": mix, "operations": operations}
+
+
+def _create_kwargs(payload: dict) -> dict:
+    kwargs = dict(payload)
+    for name in ("forecast_horizon_start", "forecast_horizon_end"):
+        kwargs[name] = datetime.fromisoformat(kwargs[name])
+    return kwargs
+
+
+# --------------------------------
+# Backends
+# --------------------------------
+
+class StorageSession:
+    """Direkte Aufrufe von storage.py ohne Cache."""
+
+    def create(self, payload: dict) -> str:
+        forecast = RiskForecast.create(**_create_kwargs(payload))
+        storage.save_forecast(forecast)
+        return forecast.forecast_id
+
+    def set_outcome(self, forecast_id: str, outcome: int) -> None:
+        storage.update_outcomes({forecast_id: outcome})
+
+    def list(self) -> int:
+        return len(storage.load_forecasts())
+
+    def aggregate(self) -> Dict[str, float]:
+        return aggregate_brier_scores(storage.load_forecasts(), by="author")
+
+
+class ColumnsSession(StorageSession):
+    """Wie StorageSession, Aggregation über den Spaltenspeicher."""
+
+    def aggregate(self) -> Dict[str, float]:
+        return aggregate_brier_scores_columns(storage.load_columns(), by="author")
+
+
+class AppSession(StorageSession):
+    """Sitzung von app.py auf dem gemeinsamen Datenbestand (app_state.py)."""
+
+    def __init__(self, shared: SharedState):
+        self._shared = shared
+
+    def create(self, payload: dict) -> str:
+        forecast = RiskForecast.create(**_create_kwargs(payload))
+        self._shared.create_forecast(forecast)
+        return forecast.forecast_id
+
+    def set_outcome(self, forecast_id: str, outcome: int) -> None:
+        self._shared.set_outcome(forecast_id, outcome)
+
+    def list(self) -> int:
+        return len(self._shared.get_state()["forecasts"])
+
+    def aggregate(self) -> Dict[str, float]:
+        return self._shared.aggregate_scores()
+
+
+class ApiSession:
+    """HTTP-Client mit Keep-Alive-Verbindung zur lokalen API."""
+
+    def __init__(self, port: int):
+        self._conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+
+    def _request(self, method: str, path: str, payload=None):
+        body = None if payload is None else json.dumps(payload)
+        self._conn.request(method, path, body=body,
+                           headers={"Content-Type": "application/json"})
+        response = self._conn.getresponse()
+        data = response.read()
+        if response.status >= 400:
+            raise RuntimeError(f"HTTP {response.status}: {data[:200]!r}")
+        return json.loads(data)
+
+    def create(self, payload: dict) -> str:
+        return self._request("POST", "/forecasts", payload)["forecast_id"]
+
+    def set_outcome(self, forecast_id: str, outcome: int) -> None:
+        self._request("POST", f"/forecasts/{forecast_id}/outcome", {"outcome": outcome})
+
+    def list(self) -> int:
+        return len(self._request("GET", "/forecasts"))
+
+    def aggregate(self) -> Dict[str, float]:
+        return self._request("GET", "/scores?by=author")["aggregate"]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class ApiServer:
+    """Startet api.py in einer eigenen Event-Loop in einem Hintergrund-Thread."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.server, self.service = asyncio.run_coroutine_threadsafe(
+            start_server("127.0.0.1", 0), self.loop
+        ).result()
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    def stop(self) -> None:
+        async def shutdown():
+            self.server.close()
+            await self.server.wait_closed()
+            await self.service.stop()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+
+BACKENDS = ("storage", "app", "columns", "api")
+
+
+# --------------------------------
+# Ausführung
+# --------------------------------
+
+@dataclass
+class RunResult:
+    backend: str
+    elapsed: float = 0.0
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    # Fehlerarten je Operation (Name der Ausnahmeklasse -> Anzahl)
+    error_types: Dict[str, Counter] = field(default_factory=lambda: defaultdict(Counter))
+    created: List[str] = field(default_factory=list)
+    outcomes: Dict[str, int] = field(default_factory=dict)
+    lost_creates: int = 0
+    lost_outcomes: int = 0
+    corrupted: bool = False
+    size_before: int = 0
+    size_after: int = 0
+
+
+def _storage_size() -> int:
+    paths = [storage.DATA_FILE, storage.revisions_file()]
+    total = sum(p.stat().st_size for p in paths if p.exists())
+    columns = storage.columns_dir()
+    if columns.exists():
+        total += sum(p.stat().st_size for p in columns.iterdir() if p.is_file())
+    return total
+
+
+def _run_user(session, operations: List[dict], result: RunResult, lock: threading.Lock) -> None:
+    for operation in operations:
+        op = operation["op"]
+        t0 = time.perf_counter()
+        try:
+            if op == "create":
+                forecast_id = session.create(operation["payload"])
+            elif op == "outcome":
+                session.set_outcome(operation["forecast_id"], operation["outcome"])
+            elif op == "list":
+                session.list()
+            else:
+                session.aggregate()
+        except Exception as exc:
+            with lock:
+                result.errors[op] += 1
+                result.error_types[op][type(exc).__name__] += 1
+            continue
+        elapsed = time.perf_counter() - t0
+
+        with lock:
+            result.latencies[op].append(elapsed)
+            if op == "create":
+                result.created.append(forecast_id)
+            elif op == "outcome":
+                result.outcomes[operation["forecast_id"]] = operation["outcome"]
+
+
+def run_backend(backend: str, scenario: dict) -> RunResult:
+    result = RunResult(backend)
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.DATA_FILE = Path(tmp) / "forecasts.json"
+        storage.save_all_forecasts(seed_forecasts(scenario["seed_size"]))
+        result.size_before = _storage_size()
+
+        server = ApiServer() if backend == "api" else None
+        shared = SharedState() if backend == "app" else None
+        sessions = []
+        for _ in scenario["operations"]:
+            if backend == "api":
+                sessions.append(ApiSession(server.port))
+            elif backend == "app":
+                sessions.append(AppSession(shared))
+            elif backend == "columns":
+                sessions.append(ColumnsSession())
+            else:
+                sessions.append(StorageSession())
+
+        lock = threading.Lock()
+        threads = [
+            threading.Thread(target=_run_user, args=(session, ops, result, lock))
+            for session, ops in zip(sessions, scenario["operations"])
+        ]
+        t0 = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        result.elapsed = time.perf_counter() - t0
+
+        if server is not None:
+            for session in sessions:
+                session.close()
+            server.stop()
+
+        result.size_after = _storage_size()
+        try:
+            final = {f.forecast_id: f for f in storage.load_forecasts()}
+        except (json.JSONDecodeError, ValueError):
+            result.corrupted = True
+            final = {}
+
+        result.lost_creates = sum(1 for fid in result.created if fid not in final)
+        result.lost_outcomes = sum(
+            1 for fid in result.outcomes
+            if fid not in final or final[fid].outcome is None
+        )
+    return result
+
+
+def report(result: RunResult) -> None:
+    total = sum(len(v) for v in result.latencies.values())
+    print(f"\n=== Backend: {result.backend} ===")
+    print(f"Operationen: {total} in {result.elapsed:.2f} s "
+          f"({total / result.elapsed if result.elapsed else 0:.1f}/s)")
+    print(f"{'Operation':<10} {'Anzahl':>7} {'Fehler':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for op in OPERATIONS:
+        values = result.latencies.get(op, [])
+        print(
+            f"{op:<10} {len(values):>7} {result.errors.get(op, 0):>7} "
+            f"{percentile(values, 0.50) * 1000:>9.2f} "
+            f"{percentile(values, 0.95) * 1000:>9.2f} "
+            f"{percentile(values, 0.99) * 1000:>9.2f}"
+        )
+    for op in OPERATIONS:
+        types = result.error_types.get(op)
+        if types:
+            details = ", ".join(f"{name} ×{count}" for name, count in types.most_common())
+            print(f"Fehler bei {op}: {details}")
+    print(f"Verlorene Erfassungen: {result.lost_creates} von {len(result.created)}")
+    print(f"Verlorene Outcomes:    {result.lost_outcomes} von {len(result.outcomes)}")
+    if result.corrupted:
+        print("Datei nach dem Lauf nicht lesbar (beschädigt)!")
+    print(f"Dateiwachstum: {result.size_before / 1e6:.2f} MB -> "
+          f"{result.size_after / 1e6:.2f} MB")
+
+
+def _parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Unbekannte Operation: {name}")
+        mix[name] = float(weight)
+    return mix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Lasttest mit gleichzeitigen Nutzern")
+    parser.add_argument("--users", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=25, help="Operationen je Nutzer")
+    parser.add_argument("--mix", type=_parse_mix, default=DEFAULT_MIX,
+                        help="z. B. create=0.3,outcome=0.2,list=0.3,aggregate=0.2")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--seed-size", type=int, default=1000,
+                        help="Anzahl Prognosen im Ausgangsbestand")
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--scenario", type=Path, help="gespeichertes Szenario abspielen")
+    parser.add_argument("--save-scenario", type=Path)
+    args = parser.parse_args()
+
+    if args.scenario:
+        scenario = json.loads(args.scenario.read_text(encoding="utf-8"))
+    else:
+        scenario = generate_scenario(
+            args.users, args.ops, args.mix, args.seed, args.seed_size
+        )
+    if args.save_scenario:
+        args.save_scenario.write_text(json.dumps(scenario), encoding="utf-8")
+
+    print(f"Nutzer: {len(scenario['operations'])}, "
+          f"Operationen je Nutzer: {len(scenario['operations'][0])}, "
+          f"Ausgangsbestand: {scenario['seed_size']}")
+
+    for backend in args.backends.split(","):
+        if backend not in BACKENDS:
+            parser.error(f"Unbekanntes Backend: {backend}")
+        report(run_backend(backend, scenario))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Spaltenorientierter Seitenspeicher (Sidecar) für bewertungsrelevante Felder.
+
+Für die Bewertung werden nur Wahrscheinlichkeit, Outcome, einige
+kategoriale Codes und Zeitstempel benötigt. Diese Felder werden neben
+der JSON-Datei in Binärdateien fester Breite abgelegt (eine Datei je
+Spalte, Zeile i = i-te Prognose) und über numpy.memmap geöffnet. So
+können Brier Scores über sehr viele Prognosen ohne JSON-Parsing und
+ohne Kopie in Python-Objekte berechnet werden.
+
+Der Speicher wird von den Schreibpfaden in storage.py synchron gehalten
+und ist stets vollständig aus der JSON-Datei rekonstruierbar.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from models import RiskForecast
+
+
+COLUMNS_FORMAT_VERSION = 1
+
+FORECAST_TYPES = ("PT1", "PT2", "PT3", "PT4")
+OUTCOME_CLASSES = ("O1", "O2", "O3", "O4")
+COMPARISON_LEVELS = ("E1", "E2", "E3")
+
+# Platzhalter für fehlende Werte
+MISSING_OUTCOME = -1
+MISSING_CODE = -1
+MISSING_TIMESTAMP = np.iinfo(np.int64).min
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Spaltenname -> Datentyp (little endian, feste Breite)
+COLUMNS: Dict[str, str] = {
+    "probability": "<f8",           # NaN = keine Wahrscheinlichkeit
+    "outcome": "<i1",               # -1 = kein Outcome
+    "forecast_type": "<u1",         # Index in FORECAST_TYPES
+    "outcome_class": "<u1",         # Index in OUTCOME_CLASSES
+    "comparison_level": "<u1",      # Index in COMPARISON_LEVELS
+    "has_threshold": "<u1",         # 1 = threshold_definition gesetzt
+    "forecast_timestamp": "<i8",    # Mikrosekunden seit 1970 (UTC)
+    "evaluation_timestamp": "<i8",  # MISSING_TIMESTAMP = nicht bewertet
+    "author": "<i4",                # Index in Wörterbuch, -1 = leer
+    "team": "<i4",                  # Index in Wörterbuch, -1 = leer
+}
+
+# Spalten, deren Codes auf ein datengetriebenes Wörterbuch verweisen
+DICTIONARY_COLUMNS = ("author", "team")
+
+META_FILE = "meta.json"
+IDS_FILE = "forecast_id.json"
+
+
+def _to_micros(value: Optional[datetime]) -> int:
+    if value is None:
+        return MISSING_TIMESTAMP
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def from_micros(value: int) -> Optional[datetime]:
+    """Wandelt einen gespeicherten Zeitstempel zurück in datetime."""
+    if value == MISSING_TIMESTAMP:
+        return None
+    return _EPOCH + timedelta(microseconds=int(value))
+
+
+def _label(value: Optional[str]) -> Optional[str]:
+    return value if isinstance(value, str) and value.strip() else None
+
+
+# --------------------------------
+# Schreiben
+# --------------------------------
+
+def _encode(forecasts: Sequence[RiskForecast]) -> Dict[str, Any]:
+    dictionaries: Dict[str, Dict[str, int]] = {name: {} for name in DICTIONARY_COLUMNS}
+
+    def code(name: str, value: Optional[str]) -> int:
+        label = _label(value)
+        if label is None:
+            return MISSING_CODE
+        return dictionaries[name].setdefault(label, len(dictionaries[name]))
+
+    n = len(forecasts)
+    arrays = {
+        "probability": np.fromiter(
+            (np.nan if f.probability is None else f.probability for f in forecasts),
+            dtype=COLUMNS["probability"], count=n),
+        "outcome": np.fromiter(
+            (MISSING_OUTCOME if f.outcome is None else f.outcome for f in forecasts),
+            dtype=COLUMNS["outcome"], count=n),
+        "forecast_type": np.fromiter(
+            (FORECAST_TYPES.index(f.forecast_type) for f in forecasts),
+            dtype=COLUMNS["forecast_type"], count=n),
+        "outcome_class": np.fromiter(
+            (OUTCOME_CLASSES.index(f.outcome_class) for f in forecasts),
+            dtype=COLUMNS["outcome_class"], count=n),
+        "comparison_level": np.fromiter(
+            (COMPARISON_LEVELS.index(f.comparison_level) for f in forecasts),
+            dtype=COLUMNS["comparison_level"], count=n),
+        "has_threshold": np.fromiter(
+            (bool(f.threshold_definition) for f in forecasts),
+            dtype=COLUMNS["has_threshold"], count=n),
+        "forecast_timestamp": np.fromiter(
+            (_to_micros(f.forecast_timestamp) for f in forecasts),
+            dtype=COLUMNS["forecast_timestamp"], count=n),
+        "evaluation_timestamp": np.fromiter(
+            (_to_micros(f.evaluation_timestamp) for f in forecasts),
+            dtype=COLUMNS["evaluation_timestamp"], count=n),
+        "author": np.fromiter(
+            (code("author", f.author) for f in forecasts),
+            dtype=COLUMNS["author"], count=n),
+        "team": np.fromiter(
+            (code("team", f.team) for f in forecasts),
+            dtype=COLUMNS["team"], count=n),
+    }
+    labels = {name: list(values) for name, values in dictionaries.items()}
+    return {"arrays": arrays, "dictionaries": labels}
+
+
+# Schreibvorgänge eines Prozesses nacheinander, damit sich die Spalten
+# zweier gleichzeitiger Speichervorgänge nicht vermischen
+_write_lock = threading.Lock()
+
+
+def _replace_file(path: Path, write) -> None:
+    # eigene temporäre Datei je Prozess und Thread
+    tmp = path.with_name(f"{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def write_columns(
+    directory: Path,
+    forecasts: Sequence[RiskForecast],
+    *,
+    source_version: Any = None,
+) -> None:
+    """
+    Schreibt den vollständigen Spaltenspeicher für die übergebenen
+    Prognosen (Zeilenreihenfolge = Listenreihenfolge).
+
+    Die Metadatei wird zuletzt ersetzt und enthält die Version der
+    JSON-Datei, aus der die Spalten erzeugt wurden.
+    """
+    encoded = _encode(forecasts)
+    with _write_lock:
+        _write_encoded(directory, forecasts, encoded, source_version)
+
+
+def _write_encoded(
+    directory: Path,
+    forecasts: Sequence[RiskForecast],
+    encoded: dict,
+    source_version: Any,
+) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, array in encoded["arrays"].items():
+        _replace_file(directory / f"{name}.bin", array.tofile)
+
+    def write_json(payload):
+        def write(path: Path) -> None:
+            with path.open("w", encoding="utf-8") as f:
+                # json.dumps (C-Encoder) statt json.dump (reines Python)
+                f.write(json.dumps(payload, ensure_ascii=False))
+        return write
+
+    _replace_file(
+        directory / IDS_FILE,
+        write_json([f.forecast_id for f in forecasts]),
+    )
+    _replace_file(directory / META_FILE, write_json({
+        "format_version": COLUMNS_FORMAT_VERSION,
+        "rows": len(forecasts),
+        "columns": COLUMNS,
+        "dictionaries": encoded["dictionaries"],
+        "source_version": list(source_version) if source_version else None,
+    }))
+
+
+def read_source_version(directory: Path) -> Optional[tuple]:
+    """
+    Liefert die beim Schreiben vermerkte Version der JSON-Datei oder
+    None, falls kein (lesbarer) Spaltenspeicher existiert.
+    """
+    try:
+        with (directory / META_FILE).open("r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if meta.get("format_version") != COLUMNS_FORMAT_VERSION:
+        return None
+    version = meta.get("source_version")
+    return tuple(version) if version else None
+
+
+# --------------------------------
+# Lesen
+# --------------------------------
+
+class ColumnStore:
+    """
+    Schreibgeschützte Sicht auf den Spaltenspeicher.
+
+    Alle Spalten sind numpy-Arrays, die per memmap direkt auf die
+    Binärdateien abgebildet werden (keine Kopie, kein Parsing).
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        with (self.directory / META_FILE).open("r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("format_version") != COLUMNS_FORMAT_VERSION:
+            raise ValueError("Unbekannte Version des Spaltenspeichers.")
+
+        self.rows: int = meta["rows"]
+        self.dictionaries: Dict[str, List[str]] = meta["dictionaries"]
+        self._forecast_ids: Optional[List[str]] = None
+        self._row_index: Optional[Dict[str, int]] = None
+
+        for name, dtype in COLUMNS.items():
+            if self.rows == 0:
+                array = np.empty(0, dtype=dtype)
+            else:
+                array = np.memmap(
+                    self.directory / f"{name}.bin",
+                    dtype=dtype,
+                    mode="r",
+                    shape=(self.rows,),
+                )
+            setattr(self, name, array)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    @property
+    def forecast_ids(self) -> List[str]:
+        """Zuordnung Zeilennummer -> forecast_id (bei Bedarf geladen)."""
+        if self._forecast_ids is None:
+            with (self.directory / IDS_FILE).open("r", encoding="utf-8") as f:
+                self._forecast_ids = json.load(f)
+        return self._forecast_ids
+
+    def row_of(self, forecast_id: str) -> Optional[int]:
+        """Zeilennummer einer Prognose oder None."""
+        if self._row_index is None:
+            self._row_index = {fid: i for i, fid in enumerate(self.forecast_ids)}
+        return self._row_index.get(forecast_id)
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in COLUMNS:
+            raise KeyError(name)
+        return getattr(self, name)
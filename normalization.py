@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional, Sequence
+
+import numpy as np
 
 from models import RiskForecast
 
@@ -33,6 +35,22 @@ def normalize_time_horizon(
     start = forecast.forecast_horizon_start
     end = start + timedelta(days=reference_horizon_days)
 
+    return _normalized_copy(
+        forecast,
+        end=end,
+        probability=forecast.probability,
+        assumption=assumption
+        or "Zeitliche Normalisierung auf Referenzhorizont zur formalen Vergleichbarkeit.",
+    )
+
+
+def _normalized_copy(
+    forecast: RiskForecast,
+    *,
+    end: datetime,
+    probability: Optional[float],
+    assumption: str,
+) -> RiskForecast:
     return RiskForecast(
         forecast_id=forecast.forecast_id,
         forecast_timestamp=forecast.forecast_timestamp,
@@ -43,10 +61,10 @@ def normalize_time_horizon(
 
         outcome_class=forecast.outcome_class,
 
-        forecast_horizon_start=start,
+        forecast_horizon_start=forecast.forecast_horizon_start,
         forecast_horizon_end=end,
 
-        probability=forecast.probability,
+        probability=probability,
 
         forecast_name=forecast.forecast_name,
         author=forecast.author,
@@ -56,11 +74,120 @@ def normalize_time_horizon(
         comparison_level="E2",
 
         normalization_applied=True,
-        normalization_assumption=assumption
-        or "Zeitliche Normalisierung auf Referenzhorizont zur formalen Vergleichbarkeit.",
+        normalization_assumption=assumption,
 
         threshold_definition=forecast.threshold_definition,
 
         outcome=forecast.outcome,
         evaluation_timestamp=forecast.evaluation_timestamp,
     )
+
+
+# --------------------------------
+# Umrechnung der Wahrscheinlichkeit (konstante Hazardrate)
+# --------------------------------
+
+HAZARD_ASSUMPTION = (
+    "Konstante Hazardrate: Umrechnung der Eintrittswahrscheinlichkeit "
+    "von {horizon:g} auf {reference:g} Tage gemäß p' = 1 − (1 − p)^(T'/T)."
+)
+
+ZERO_HORIZON_ASSUMPTION = (
+    "Prognosehorizont ohne Dauer (T = 0): Eintrittswahrscheinlichkeit "
+    "unverändert übernommen, keine Umrechnung auf {reference:g} Tage möglich."
+)
+
+
+def convert_probabilities(
+    probabilities,
+    horizon_days,
+    reference_horizon_days,
+) -> np.ndarray:
+    """
+    Rechnet Eintrittswahrscheinlichkeiten vektorisiert von Horizont T auf
+    Horizont T' um.
+
+    Annahme: Das Ereignis tritt mit über die Zeit konstanter Hazardrate
+    ein (Poisson-Prozess), d. h. p' = 1 − (1 − p)^(T'/T). Alle Argumente
+    können Skalare oder Arrays (Broadcasting) sein; NaN bleibt NaN.
+    """
+    p = np.asarray(probabilities, dtype=float)
+    horizon = np.asarray(horizon_days, dtype=float)
+    reference = np.asarray(reference_horizon_days, dtype=float)
+
+    if np.any(horizon <= 0) or np.any(reference <= 0):
+        raise ValueError("Horizontlängen müssen > 0 sein.")
+    if np.any((p < 0.0) | (p > 1.0)):
+        raise ValueError("probability muss im Bereich [0,1] liegen.")
+
+    # log1p/expm1 für numerische Stabilität bei kleinen p; p = 1 bleibt 1
+    with np.errstate(divide="ignore"):
+        return -np.expm1(np.log1p(-p) * (reference / horizon))
+
+
+def normalize_time_horizons(
+    forecasts: Sequence[RiskForecast],
+    *,
+    reference_horizon_days: int = DEFAULT_REFERENCE_HORIZON_DAYS,
+    assumption: Optional[str] = None,
+) -> List[RiskForecast]:
+    """
+    Normalisiert einen ganzen Bestand auf einen gemeinsamen
+    Referenzhorizont und rechnet dabei die Wahrscheinlichkeiten unter
+    der Annahme einer konstanten Hazardrate um (convert_probabilities).
+
+    Im Unterschied zu normalize_time_horizon wird die Wahrscheinlichkeit
+    angepasst; die Annahme wird je Prognose (mit T und T') in
+    normalization_assumption dokumentiert; eine übergebene assumption
+    wird angehängt. Prognosen ohne Wahrscheinlichkeit oder mit
+    Horizont ohne Dauer werden nur zeitlich normalisiert.
+    """
+    if not forecasts:
+        return []
+
+    for forecast in forecasts:
+        if forecast.forecast_horizon_start is None or forecast.forecast_horizon_end is None:
+            raise ValueError("Prognosehorizont muss vollständig angegeben sein.")
+
+    horizon_days = np.fromiter(
+        (
+            (f.forecast_horizon_end - f.forecast_horizon_start) / timedelta(days=1)
+            for f in forecasts
+        ),
+        dtype=float,
+        count=len(forecasts),
+    )
+    probabilities = np.fromiter(
+        (np.nan if f.probability is None else f.probability for f in forecasts),
+        dtype=float,
+        count=len(forecasts),
+    )
+
+    # Horizonte ohne Dauer (end == start) sind zulässig, lassen sich aber
+    # nicht umrechnen: Wahrscheinlichkeit bleibt dort unverändert.
+    convertible = horizon_days > 0
+    converted = np.where(
+        convertible,
+        convert_probabilities(
+            probabilities,
+            np.where(convertible, horizon_days, 1.0),
+            reference_horizon_days,
+        ),
+        probabilities,
+    )
+
+    reference = timedelta(days=reference_horizon_days)
+    results = []
+    for forecast, p, horizon, ok in zip(forecasts, converted, horizon_days, convertible):
+        template = HAZARD_ASSUMPTION if ok else ZERO_HORIZON_ASSUMPTION
+        text = template.format(horizon=horizon, reference=reference_horizon_days)
+        if assumption:
+            text = f"{text} {assumption}"
+
+        results.append(_normalized_copy(
+            forecast,
+            end=forecast.forecast_horizon_start + reference,
+            probability=None if np.isnan(p) else float(p),
+            assumption=text,
+        ))
+    return results
@@ -0,0 +1,213 @@
+"""
+Parallele, chunkweise Bewertung großer Prognosebestände.
+
+Für eine vollständige Neubewertung (z. B. nach Änderung der
+Klassifikations- oder Schwellenlogik) wird der Bestand in Chunks fester
+Größe zerlegt. Jeder Chunk wird in einem Worker-Prozess zu einem
+zusammenführbaren Teilergebnis (Summe, Anzahl, Teilergebnisse je Gruppe)
+verdichtet; die Teilergebnisse werden anschließend in Chunk-Reihenfolge
+zusammengeführt.
+
+Da die Chunk-Grenzen nur von chunk_size abhängen und die Reduktion stets
+in derselben Reihenfolge erfolgt, ist das Ergebnis bitgenau unabhängig
+von der Anzahl der Worker.
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from models import RiskForecast
+from scoring import brier_score, is_brier_applicable
+
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+@dataclass
+class GroupPartial:
+    """Teilergebnis einer Gruppe (z. B. eines Autors)."""
+
+    total: float = 0.0
+    count: int = 0
+
+    def merge(self, other: "GroupPartial") -> "GroupPartial":
+        return GroupPartial(self.total + other.total, self.count + other.count)
+
+
+@dataclass
+class ScorePartial:
+    """
+    Zusammenführbares Teilergebnis der Bewertung eines Chunks.
+
+    groups enthält je Aggregationsattribut die Teilergebnisse der
+    Gruppen in Reihenfolge ihres ersten Auftretens.
+    """
+
+    total: float = 0.0
+    count: int = 0
+    groups: Dict[str, Dict[str, GroupPartial]] = field(default_factory=dict)
+    scores: List[Dict[str, float]] = field(default_factory=list)
+
+    def merge(self, other: "ScorePartial") -> "ScorePartial":
+        return reduce_partials([self, other])
+
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def group_means(self, by: str) -> Dict[str, float]:
+        return {
+            key: part.total / part.count
+            for key, part in self.groups.get(by, {}).items()
+            if part.count > 0
+        }
+
+
+def score_chunk(
+    forecasts: Sequence[RiskForecast],
+    *,
+    by: Sequence[str] = ("author",),
+    include_scores: bool = False,
+    applicable: Callable[[RiskForecast], bool] = is_brier_applicable,
+) -> ScorePartial:
+    """
+    Bewertet einen Chunk und liefert dessen Teilergebnis.
+
+    Summen werden innerhalb des Chunks mit math.fsum gebildet und sind
+    damit unabhängig von der Reihenfolge der Prognosen im Chunk.
+    """
+    scores: List[float] = []
+    group_scores: Dict[str, Dict[str, List[float]]] = {attr: {} for attr in by}
+    results: List[Dict[str, float]] = []
+
+    for forecast in forecasts:
+        if not applicable(forecast):
+            continue
+
+        score = brier_score(forecast.probability, forecast.outcome)
+        scores.append(score)
+
+        for attr in by:
+            key = getattr(forecast, attr, None)
+            if isinstance(key, str) and key.strip():
+                group_scores[attr].setdefault(key, []).append(score)
+
+        if include_scores:
+            results.append({
+                "forecast_id": forecast.forecast_id,
+                "brier_score": score,
+            })
+
+    return ScorePartial(
+        total=math.fsum(scores),
+        count=len(scores),
+        groups={
+            attr: {
+                key: GroupPartial(math.fsum(values), len(values))
+                for key, values in parts.items()
+            }
+            for attr, parts in group_scores.items()
+        },
+        scores=results,
+    )
+
+
+# Datenbestand im Worker-Prozess (über den Pool-Initializer gesetzt)
+_worker_forecasts: Sequence[RiskForecast] = ()
+
+
+def _init_worker(forecasts: Sequence[RiskForecast]) -> None:
+    global _worker_forecasts
+    _worker_forecasts = forecasts
+
+
+def _score_range(bounds: Tuple[int, int], **options) -> ScorePartial:
+    start, end = bounds
+    return score_chunk(_worker_forecasts[start:end], **options)
+
+
+def _chunk_bounds(total: int, chunk_size: int) -> List[Tuple[int, int]]:
+    return [
+        (start, min(start + chunk_size, total))
+        for start in range(0, total, chunk_size)
+    ]
+
+
+def reduce_partials(partials: Sequence[ScorePartial]) -> ScorePartial:
+    """
+    Führt Teilergebnisse deterministisch in der übergebenen Reihenfolge
+    zusammen.
+    """
+    result = ScorePartial()
+    for part in partials:
+        result.total += part.total
+        result.count += part.count
+        for by, parts in part.groups.items():
+            target = result.groups.setdefault(by, {})
+            for key, group in parts.items():
+                target[key] = target[key].merge(group) if key in target else group
+        result.scores.extend(part.scores)
+    return result
+
+
+def parallel_evaluate(
+    forecasts: Sequence[RiskForecast],
+    *,
+    by: Sequence[str] = ("author",),
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    include_scores: bool = False,
+    applicable: Callable[[RiskForecast], bool] = is_brier_applicable,
+) -> ScorePartial:
+    """
+    Bewertet alle Prognosen chunkweise in einem Prozesspool.
+
+    workers=1 bewertet im aufrufenden Prozess (ohne Pool). Das Ergebnis
+    hängt nur von chunk_size ab, nicht von workers. Eine abweichende
+    Zulässigkeitsregel (applicable) muss als Modulfunktion übergeben
+    werden, damit sie an die Worker übertragen werden kann.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size muss >= 1 sein.")
+
+    options = dict(
+        by=tuple(by),
+        include_scores=include_scores,
+        applicable=applicable,
+    )
+    bounds = _chunk_bounds(len(forecasts), chunk_size)
+
+    if workers == 1:
+        return reduce_partials([
+            score_chunk(forecasts[start:end], **options) for start, end in bounds
+        ])
+
+    # Der Bestand wird einmalig je Worker übergeben (bei fork ohne
+    # Serialisierung), die Aufgaben selbst sind nur Indexbereiche.
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(forecasts,),
+    ) as executor:
+        # map liefert die Ergebnisse in Chunk-Reihenfolge
+        partials = executor.map(partial(_score_range, **options), bounds)
+        return reduce_partials(list(partials))
+
+
+def parallel_scores(
+    forecasts: Sequence[RiskForecast],
+    *,
+    by: str = "author",
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Tuple[Optional[float], Dict[str, float]]:
+    """
+    Paralleles Gegenstück zu mean_brier_score und
+    aggregate_brier_scores in einem Durchlauf.
+    """
+    result = parallel_evaluate(
+        forecasts, by=(by,), workers=workers, chunk_size=chunk_size
+    )
+    return result.mean(), result.group_means(by)
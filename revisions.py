@@ -0,0 +1,276 @@
+"""
+Revisionshistorie von Prognosen mit Delta-Kodierung.
+
+Jede Änderung einer Prognose (Outcome-Erfassung, Normalisierung,
+Schwellenbildung, ...) wird als Revision in einer Append-only-Datei
+(JSON Lines) protokolliert. Gespeichert werden nur die geänderten Felder
+gegenüber der Vorversion; in festen Abständen wird zusätzlich ein
+vollständiger Stand (Keyframe) abgelegt, damit jede Version mit wenigen
+Schritten rekonstruiert werden kann.
+
+Zeilenformat:
+    {"id": ..., "rev": 0, "ts": ..., "reason": ..., "full": {...}}   Keyframe
+    {"id": ..., "rev": 3, "ts": ..., "reason": ..., "delta": {...}}  Delta
+
+Mehrere Prozesse (Oberfläche, API) können dieselbe Datei nutzen.
+Geschrieben wird nur unter einer exklusiven Dateisperre; Leser
+überspringen eine noch unvollständige letzte Zeile, ohne die Datei zu
+verändern. Erst ein Schreiber entfernt unter der Sperre eine
+unvollständige Zeile, die ein abgebrochener Schreibvorgang hinterlassen
+hat.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: keine Sperre zwischen Prozessen
+    fcntl = None  # type: ignore[assignment]
+
+
+# Jede KEYFRAME_INTERVAL-te Revision wird vollständig gespeichert
+KEYFRAME_INTERVAL = 16
+
+
+@dataclass(frozen=True)
+class Revision:
+    """Metadaten einer Revision (ohne Inhalt)."""
+
+    forecast_id: str
+    revision: int
+    timestamp: datetime
+    reason: Optional[str]
+    changed_fields: Tuple[str, ...]
+    keyframe: bool
+
+
+class RevisionLog:
+    """
+    In-Memory-Sicht auf eine Revisionsdatei.
+
+    Hält je Prognose die Einträge in Revisionsreihenfolge sowie den
+    jeweils aktuellen Stand, gegen den neue Versionen verglichen werden.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._entries: Dict[str, List[dict]] = {}
+        self._heads: Dict[str, dict] = {}
+        # gelesene Bytes bzw. Bytes vollständiger Zeilen
+        self._size = 0
+        self._complete = 0
+        # Streamlit-Sitzungen und API-Executor teilen sich eine Instanz
+        self._lock = threading.RLock()
+        self._load()
+
+    # ---------- Laden ----------
+
+    def _load(self) -> None:
+        self._entries.clear()
+        self._heads.clear()
+        if not self.path.exists():
+            self._size = self._complete = 0
+            return
+
+        data = self.path.read_bytes()
+        # eine unvollständige letzte Zeile wird (noch) nicht gelesen
+        complete = data.rfind(b"\n") + 1
+        for line in data[:complete].decode("utf-8").splitlines():
+            if line.strip():
+                self._add(json.loads(line))
+        self._size = len(data)
+        self._complete = complete
+
+    def _add(self, entry: dict) -> None:
+        forecast_id = entry["id"]
+        self._entries.setdefault(forecast_id, []).append(entry)
+        if "full" in entry:
+            self._heads[forecast_id] = dict(entry["full"])
+        else:
+            self._heads[forecast_id].update(entry["delta"])
+
+    def refresh(self) -> None:
+        """Liest die Datei neu ein, falls sie extern verändert wurde."""
+        with self._lock:
+            size = self.path.stat().st_size if self.path.exists() else 0
+            if size != self._size:
+                self._load()
+
+    @property
+    def empty(self) -> bool:
+        """True, solange keine Revision protokolliert ist."""
+        with self._lock:
+            return not self._entries
+
+    # ---------- Schreiben ----------
+
+    @contextmanager
+    def _locked_file(self) -> Iterator[Any]:
+        """
+        Öffnet die Datei zum Anhängen unter einer exklusiven Sperre und
+        gleicht den In-Memory-Stand an. Eine unvollständige letzte Zeile
+        stammt dann von einem abgebrochenen Schreiber und wird entfernt.
+        """
+        with self._lock, self.path.open("ab") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            self.refresh()
+            if self._complete < self._size:
+                f.truncate(self._complete)
+                self._size = self._complete
+            yield f
+
+    def record(
+        self,
+        records: Iterable[dict],
+        *,
+        reason: Optional[str] = None,
+        timestamp: Optional[datetime] = None,
+    ) -> int:
+        """
+        Protokolliert alle Datensätze, die sich gegenüber ihrer letzten
+        Revision geändert haben, und liefert die Anzahl neuer Revisionen.
+        """
+        with self._locked_file() as f:
+            return self._record(f, records, reason, timestamp)
+
+    @contextmanager
+    def pending(
+        self,
+        records: Iterable[dict],
+        *,
+        reason: Optional[str] = None,
+        timestamp: Optional[datetime] = None,
+    ) -> Iterator[int]:
+        """
+        Wie record, hält die Sperre aber für die Dauer des with-Blocks
+        (z. B. das Schreiben der Prognosedatei). Schlägt der Block fehl,
+        werden die Revisionen wieder entfernt.
+        """
+        with self._locked_file() as f:
+            start = self._size
+            count = self._record(f, records, reason, timestamp)
+            try:
+                yield count
+            except BaseException:
+                if count:
+                    f.truncate(start)
+                    self._load()
+                raise
+
+    def _record(
+        self,
+        f: Any,
+        records: Iterable[dict],
+        reason: Optional[str],
+        timestamp: Optional[datetime],
+    ) -> int:
+        ts = (timestamp or datetime.utcnow()).isoformat()
+        lines: List[str] = []
+
+        for record in records:
+            forecast_id = record["forecast_id"]
+            head = self._heads.get(forecast_id)
+            if head is None:
+                revision = 0
+            else:
+                if head == record:  # unverändert (Vergleich in C, ohne Delta)
+                    continue
+                delta = {k: v for k, v in record.items() if head.get(k) != v}
+                if not delta:
+                    continue
+                revision = len(self._entries[forecast_id])
+
+            entry: Dict[str, Any] = {
+                "id": forecast_id,
+                "rev": revision,
+                "ts": ts,
+                "reason": reason,
+            }
+            if revision % KEYFRAME_INTERVAL == 0:
+                entry["full"] = dict(record)
+            else:
+                entry["delta"] = delta
+
+            self._add(entry)
+            lines.append(json.dumps(entry, ensure_ascii=False, separators=(",", ":")))
+
+        if lines:
+            try:
+                f.write(("\n".join(lines) + "\n").encode("utf-8"))
+                f.flush()
+            except OSError:
+                # In-Memory-Stand wieder an die Datei angleichen
+                self._load()
+                raise
+            self._size = self._complete = os.fstat(f.fileno()).st_size
+        return len(lines)
+
+    # ---------- Lesen ----------
+
+    def revision_count(self, forecast_id: str) -> int:
+        with self._lock:
+            return len(self._entries.get(forecast_id, ()))
+
+    def history(self, forecast_id: str) -> List[Revision]:
+        """Metadaten aller Revisionen einer Prognose (älteste zuerst)."""
+        with self._lock:
+            entries = list(self._entries.get(forecast_id, ()))
+        return [
+            Revision(
+                forecast_id=forecast_id,
+                revision=entry["rev"],
+                timestamp=datetime.fromisoformat(entry["ts"]),
+                reason=entry.get("reason"),
+                changed_fields=tuple(entry.get("full") or entry["delta"]),
+                keyframe="full" in entry,
+            )
+            for entry in entries
+        ]
+
+    def version(self, forecast_id: str, revision: Optional[int] = None) -> dict:
+        """
+        Rekonstruiert den Datensatz einer Prognose zu einer Revision
+        (Standard: aktuelle Revision).
+
+        Ausgehend vom letzten Keyframe vor der Revision werden höchstens
+        KEYFRAME_INTERVAL - 1 Deltas angewendet.
+        """
+        with self._lock:
+            entries = list(self._entries.get(forecast_id, ()))
+        if not entries:
+            raise KeyError(forecast_id)
+        if revision is None:
+            revision = len(entries) - 1
+        if not 0 <= revision < len(entries):
+            raise IndexError(f"Revision {revision} existiert nicht für {forecast_id}.")
+
+        start = revision - revision % KEYFRAME_INTERVAL
+        state = dict(entries[start]["full"])
+        for entry in entries[start + 1:revision + 1]:
+            state.update(entry["delta"])
+        return state
+
+
+# Geöffnete Revisionsdateien je Pfad
+_logs: Dict[Path, RevisionLog] = {}
+_logs_lock = threading.Lock()
+
+
+def open_log(path: Path) -> RevisionLog:
+    """Liefert die (gecachte) Revisionssicht für eine Datei."""
+    path = Path(path)
+    with _logs_lock:
+        log = _logs.get(path)
+        if log is None:
+            log = _logs[path] = RevisionLog(path)
+            return log
+    log.refresh()
+    return log
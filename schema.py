@@ -0,0 +1,379 @@
+"""
+Formales, versioniertes Schema des Prognoseformats.
+
+Das Schema wird einmalig zu einem pydantic-Validator kompiliert und
+prüft ganze Batches von Datensätzen in einem Aufruf. Fehler werden
+je Datensatz und Feld gemeldet, statt fehlende Angaben stillschweigend
+mit Standardwerten zu füllen (vgl. dict_to_forecast).
+
+Drei Schemata werden unterschieden:
+- ForecastRecord:   gespeicherter Datensatz (Format von forecast_to_dict)
+- ForecastDocument: gespeicherte Datei mit schema_version und Datensätzen
+- ForecastInput:    Eingabe zur Erfassung neuer Prognosen (RiskForecast.create)
+
+Die Validatoren übernehmen die Feldregeln dieser Modelle, erzeugen aber
+direkt RiskForecast-Instanzen (ohne Zwischenobjekt je Datensatz und
+ohne erneute Prüfung in RiskForecast.create).
+"""
+
+import json
+import uuid
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from typing import Annotated, Any, Dict, Iterable, List, Literal, Optional, Type, Union
+
+from pydantic import (
+    AfterValidator,
+    BaseModel,
+    ConfigDict,
+    Field,
+    GetPydanticSchema,
+    TypeAdapter,
+    ValidationError,
+    ValidationInfo,
+    field_validator,
+)
+from pydantic_core import core_schema
+
+from models import RiskForecast
+
+
+SCHEMA_VERSION = "1.0"
+SCHEMA_ID = f"urn:csra:risk-forecast:{SCHEMA_VERSION}"
+
+
+def _to_naive_utc(value: datetime) -> datetime:
+    # Das Format speichert durchgängig naive UTC-Zeitpunkte
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+# Zeitpunkte liegen in JSON als ISO-8601-Zeichenketten vor; Angaben mit
+# Zeitzone (z. B. "Z", "+02:00") werden nach naiver UTC-Zeit umgerechnet
+Timestamp = Annotated[datetime, Field(strict=False), AfterValidator(_to_naive_utc)]
+NonEmptyText = Annotated[str, Field(min_length=1, pattern=r"\S")]
+Probability = Annotated[float, Field(ge=0.0, le=1.0)]
+
+
+def _blank_to_none(value: Optional[str]) -> Optional[str]:
+    return (value or "").strip() or None
+
+
+def _name_or_default(value: Optional[str]) -> str:
+    return (value or "").strip() or "Unbenannte Prognose"
+
+
+# Erfassung: Texte wie in RiskForecast.create bereinigen
+InputText = Annotated[NonEmptyText, AfterValidator(str.strip)]
+OptionalText = Annotated[Optional[str], AfterValidator(_blank_to_none)]
+
+
+def _check_horizon(end: datetime, info: ValidationInfo) -> datetime:
+    start = info.data.get("forecast_horizon_start")
+    if start is not None and end < start:
+        raise ValueError("forecast_horizon_end muss >= forecast_horizon_start sein.")
+    return end
+
+
+class ForecastRecord(BaseModel):
+    """
+    Gespeicherter Prognosedatensatz in Schemaversion 1.0.
+
+    Alle Felder sind Pflichtfelder; optionale Angaben werden explizit
+    als null gespeichert.
+    """
+
+    model_config = ConfigDict(extra="forbid", strict=True, title="RiskForecast")
+
+    forecast_id: NonEmptyText
+    forecast_name: str
+    author: Optional[str]
+    team: Optional[str]
+
+    forecast_type: Literal["PT1", "PT2", "PT3", "PT4"]
+    outcome_class: Literal["O1", "O2", "O3", "O4"]
+    comparison_level: Literal["E1", "E2", "E3"]
+
+    event_description: NonEmptyText
+    event_criteria: NonEmptyText
+
+    forecast_timestamp: Timestamp
+    forecast_horizon_start: Timestamp
+    forecast_horizon_end: Timestamp
+
+    probability: Probability
+    rationale: Optional[str]
+
+    normalization_applied: bool
+    normalization_assumption: Optional[str]
+    threshold_definition: Optional[str]
+
+    outcome: Optional[Literal[0, 1]]
+    evaluation_timestamp: Optional[Timestamp]
+
+    @field_validator("forecast_horizon_end")
+    @classmethod
+    def check_horizon(cls, end: datetime, info: ValidationInfo) -> datetime:
+        return _check_horizon(end, info)
+
+
+class ForecastInput(BaseModel):
+    """
+    Eingabe zur Erfassung einer neuen Prognose (Parameter von
+    RiskForecast.create).
+    """
+
+    model_config = ConfigDict(extra="forbid", strict=True, title="RiskForecastInput")
+
+    forecast_type: Literal["PT1", "PT2", "PT3", "PT4"]
+    outcome_class: Literal["O1", "O2", "O3", "O4"]
+    event_description: InputText
+    event_criteria: InputText
+    forecast_horizon_start: Timestamp
+    forecast_horizon_end: Timestamp
+    probability: Probability
+
+    forecast_name: Annotated[Optional[str], AfterValidator(_name_or_default)] = Field(
+        None, validate_default=True
+    )
+    author: OptionalText = None
+    team: OptionalText = None
+    rationale: OptionalText = None
+    threshold_definition: Optional[str] = None
+    normalization_applied: bool = False
+    normalization_assumption: Optional[str] = None
+
+    @field_validator("forecast_horizon_end")
+    @classmethod
+    def check_horizon(cls, end: datetime, info: ValidationInfo) -> datetime:
+        return _check_horizon(end, info)
+
+
+class ForecastDocument(BaseModel):
+    """
+    Gespeicherte Datei: Schemaversion und Datensätze.
+
+    Dateien ohne Versionsangabe (reine Liste, vor Einführung der
+    Versionierung) werden vor der Prüfung migriert (migrate_legacy_record).
+    """
+
+    model_config = ConfigDict(extra="forbid", strict=True, title="RiskForecastDocument")
+
+    schema_version: Literal[SCHEMA_VERSION]  # type: ignore[valid-type]
+    forecasts: List[ForecastRecord]
+
+
+# --------------------------------
+# Kompilierte Validatoren
+# --------------------------------
+
+def _forecast_type(model: Type[BaseModel], generated: Dict[str, Any]) -> Any:
+    """
+    RiskForecast mit den Feldregeln von model als Kern-Schema: pydantic
+    prüft die Felder und befüllt die Dataclass direkt. generated enthält
+    Felder, die nicht eingegeben, sondern erzeugt werden (init=False).
+    """
+    model_schema = model.__pydantic_core_schema__
+    dataclass_fields = [
+        core_schema.dataclass_field(name, field["schema"])
+        for name, field in model_schema["schema"]["fields"].items()
+    ] + [
+        core_schema.dataclass_field(name, schema, init=False)
+        for name, schema in generated.items()
+    ]
+    schema = core_schema.dataclass_schema(
+        RiskForecast,
+        core_schema.dataclass_args_schema("RiskForecast", dataclass_fields),
+        [f.name for f in fields(RiskForecast)],
+        config=model_schema["config"],
+        # strict gilt für die Felder; die Eingabe selbst ist ein Dictionary
+        strict=False,
+    )
+    return Annotated[RiskForecast, GetPydanticSchema(lambda _type, _handler: schema)]
+
+
+def _generated(default_factory, **kwargs) -> Any:
+    return core_schema.with_default_schema(
+        core_schema.any_schema(), default_factory=default_factory, **kwargs
+    )
+
+
+_StoredForecast = _forecast_type(ForecastRecord, {})
+
+# Von RiskForecast.create vergebene Felder
+_NewForecast = _forecast_type(ForecastInput, {
+    "forecast_id": _generated(lambda: str(uuid.uuid4())),
+    "forecast_timestamp": _generated(datetime.utcnow),
+    "comparison_level": _generated(
+        lambda data: "E2" if data["normalization_applied"] else "E1",
+        default_factory_takes_data=True,
+    ),
+    "outcome": _generated(lambda: None),
+    "evaluation_timestamp": _generated(lambda: None),
+})
+
+
+class _StoredDocument(BaseModel):
+    """ForecastDocument, dessen Datensätze direkt als RiskForecast entstehen."""
+
+    model_config = ForecastDocument.model_config
+
+    schema_version: Literal[SCHEMA_VERSION]  # type: ignore[valid-type]
+    forecasts: List[_StoredForecast]  # type: ignore[valid-type]
+
+
+# Einmalig kompilierte Batch-Validatoren
+_RECORD_BATCH = TypeAdapter(List[_StoredForecast])
+_INPUT_BATCH = TypeAdapter(List[_NewForecast])
+_DOCUMENT = TypeAdapter(_StoredDocument)
+
+
+# --------------------------------
+# Fehlerdarstellung
+# --------------------------------
+
+@dataclass(frozen=True)
+class FieldError:
+    """Einzelner Validierungsfehler eines Datensatzes."""
+
+    index: Optional[int]
+    field: str
+    message: str
+
+    def to_dict(self) -> dict:
+        return {"index": self.index, "field": self.field, "error": self.message}
+
+
+class SchemaValidationError(ValueError):
+    """
+    Ein oder mehrere Datensätze verletzen das Prognoseschema.
+    """
+
+    def __init__(self, errors: List[FieldError]):
+        self.errors = errors
+        preview = "; ".join(
+            f"[{e.index}] {e.field or '<Datensatz>'}: {e.message}" for e in errors[:5]
+        )
+        more = f" (+{len(errors) - 5} weitere)" if len(errors) > 5 else ""
+        super().__init__(f"Schemaverletzung: {preview}{more}")
+
+
+def _field_errors(exc: ValidationError) -> List[FieldError]:
+    errors = []
+    for error in exc.errors(include_url=False):
+        if error["type"] == "default_factory_not_called":
+            # Folgefehler eines erzeugten Felds (z. B. comparison_level)
+            continue
+        loc = list(error["loc"])
+        if loc[:1] == ["forecasts"] and len(loc) > 1:  # ForecastDocument
+            loc.pop(0)
+        index = loc.pop(0) if loc and isinstance(loc[0], int) else None
+        errors.append(FieldError(
+            index=index,
+            field=".".join(str(part) for part in loc),
+            message=error["msg"],
+        ))
+    return errors
+
+
+# --------------------------------
+# Öffentliche API
+# --------------------------------
+
+def validate_records(records: Iterable[Any]) -> List[RiskForecast]:
+    """
+    Validiert gespeicherte Datensätze (Dictionaries) als Batch und
+    rekonstruiert die Prognosen.
+
+    Wirft SchemaValidationError mit allen Feldfehlern des Batches.
+    """
+    try:
+        return _RECORD_BATCH.validate_python(list(records))
+    except ValidationError as exc:
+        raise SchemaValidationError(_field_errors(exc)) from None
+
+
+# Vor Version 1.0 gespeicherte Dateien (reine Liste) kennen die später
+# ergänzten Felder noch nicht; dict_to_forecast setzt dafür dieselben Werte
+LEGACY_DEFAULTS: Dict[str, Any] = {
+    "forecast_name": "Unbenannte Prognose",
+    "author": None,
+    "team": None,
+    "forecast_type": "PT1",
+    "outcome_class": "O1",
+    "comparison_level": "E1",
+    "rationale": None,
+    "normalization_applied": False,
+    "normalization_assumption": None,
+    "threshold_definition": None,
+    "outcome": None,
+    "evaluation_timestamp": None,
+}
+
+
+def migrate_legacy_record(record: Any) -> Any:
+    """
+    Hebt einen Datensatz ohne Versionsangabe auf Schemaversion 1.0:
+    forecast_title wird zu forecast_name, fehlende neuere Felder erhalten
+    ihre Standardwerte. Pflichtfelder des Prognosekerns werden nicht
+    ergänzt und weiterhin streng geprüft.
+    """
+    if not isinstance(record, dict):
+        return record
+    record = dict(record)
+    title = record.pop("forecast_title", None)
+    if record.get("forecast_name") is None and title is not None:
+        record["forecast_name"] = title
+    for name, default in LEGACY_DEFAULTS.items():
+        if record.get(name) is None:
+            record[name] = default
+    return record
+
+
+def validate_json(data: Union[str, bytes]) -> List[RiskForecast]:
+    """
+    Validiert ein gespeichertes JSON-Dokument.
+
+    Versionierte Dateien (ForecastDocument) werden direkt aus den
+    Rohdaten validiert, ohne vorheriges json.loads. Ältere Dateien im
+    reinen Listenformat werden zuerst migriert (migrate_legacy_record).
+    """
+    head = data.lstrip()[:1]
+    try:
+        if head in ("{", b"{"):
+            return _DOCUMENT.validate_json(data).forecasts
+        records = json.loads(data)
+        if isinstance(records, list):
+            records = [migrate_legacy_record(record) for record in records]
+        return _RECORD_BATCH.validate_python(records)
+    except ValidationError as exc:
+        raise SchemaValidationError(_field_errors(exc)) from None
+
+
+def validate_inputs(payloads: Iterable[Any]) -> List[RiskForecast]:
+    """
+    Validiert Erfassungs-Eingaben als Batch und erzeugt daraus neue
+    Prognosen wie RiskForecast.create (ID, Zeitpunkt, Vergleichsebene).
+    """
+    try:
+        return _INPUT_BATCH.validate_python(list(payloads))
+    except ValidationError as exc:
+        raise SchemaValidationError(_field_errors(exc)) from None
+
+
+def json_schema(kind: Literal["record", "input", "document"] = "record") -> dict:
+    """
+    Liefert das Schema als JSON Schema (Draft 2020-12) zur Weitergabe
+    an externe Werkzeuge.
+    """
+    model = {
+        "record": ForecastRecord,
+        "input": ForecastInput,
+        "document": ForecastDocument,
+    }[kind]
+    schema = model.model_json_schema()
+    schema["$schema"] = "https://json-schema.org/draft/2020-12/schema"
+    schema["$id"] = SCHEMA_ID if kind == "record" else f"{SCHEMA_ID}:{kind}"
+    schema["version"] = SCHEMA_VERSION
+    return schema
@@ -1,4 +1,18 @@
-from typing import List, Dict, Optional
+from bisect import bisect_right
+from datetime import datetime, timezone
+from itertools import accumulate
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from columnar import (
+    COMPARISON_LEVELS,
+    FORECAST_TYPES,
+    OUTCOME_CLASSES,
+    ColumnStore,
+    MISSING_CODE,
+    MISSING_OUTCOME,
+)
 from models import RiskForecast
 
 
@@ -51,36 +65,76 @@ def evaluate_forecasts(
     Die Funktion dient ausschließlich der exemplarischen Evaluation
     des Prognoseformats und nicht der Leistungsbewertung einzelner Personen.
     """
-    results: List[Dict[str, float]] = []
+    return list(iter_evaluations(forecasts))
 
+
+def iter_evaluations(forecasts: Iterable[RiskForecast]) -> Iterator[Dict[str, float]]:
+    """
+    Wie evaluate_forecasts, liefert die Ergebnisse jedoch einzeln
+    (z. B. zum abschnittsweisen Streamen großer Bestände).
+    """
     for forecast in forecasts:
         if not is_brier_applicable(forecast):
             continue
 
-        results.append(
-            {
-                "forecast_id": forecast.forecast_id,
-                "brier_score": brier_score(
-                    forecast.probability,
-                    forecast.outcome
-                ),
-            }
-        )
+        yield {
+            "forecast_id": forecast.forecast_id,
+            "brier_score": brier_score(
+                forecast.probability,
+                forecast.outcome
+            ),
+        }
+
+
+def known_as_of(forecast: RiskForecast) -> Optional[datetime]:
+    """
+    Zeitpunkt, ab dem eine bewertete Prognose in die Auswertung eingeht:
+    Prognose und Outcome müssen beide bereits erfasst sein.
+
+    Outcomes ohne evaluation_timestamp (Altbestände) sind keinem
+    Zeitpunkt zuordenbar und liefern None.
+    """
+    if forecast.evaluation_timestamp is None:
+        return None
+    return max(forecast.forecast_timestamp, forecast.evaluation_timestamp)
 
-    return results
+
+def _naive_utc(as_of: datetime) -> datetime:
+    # Zeitpunkte werden naiv in UTC gespeichert (schema.Timestamp)
+    if as_of.tzinfo is not None:
+        return as_of.astimezone(timezone.utc).replace(tzinfo=None)
+    return as_of
+
+
+def _scoreable(forecast: RiskForecast, as_of: Optional[datetime]) -> bool:
+    if not is_brier_applicable(forecast):
+        return False
+    if as_of is None:
+        return True
+    known = known_as_of(forecast)
+    return known is not None and known <= as_of
 
 
 def mean_brier_score(
-    forecasts: List[RiskForecast]
+    forecasts: List[RiskForecast],
+    as_of: Optional[datetime] = None,
 ) -> Optional[float]:
     """
     Berechnet den durchschnittlichen Brier Score über alle
     zulässig bewerteten Prognosen.
+
+    Mit as_of werden nur Prognosen berücksichtigt, deren Prognose- und
+    Bewertungszeitpunkt <= as_of liegen (Stand zum Zeitpunkt as_of);
+    zeitzonenbehaftete Stichtage werden nach UTC umgerechnet. Jeder
+    Aufruf durchläuft den gesamten Bestand (O(n)); logarithmische
+    Abfragen je Stichtag bietet nur AsOfIndex.
     """
+    if as_of is not None:
+        as_of = _naive_utc(as_of)
     scores = [
         brier_score(f.probability, f.outcome)
         for f in forecasts
-        if is_brier_applicable(f)
+        if _scoreable(f, as_of)
     ]
 
     if not scores:
@@ -91,7 +145,8 @@ def mean_brier_score(
 
 def aggregate_brier_scores(
     forecasts: List[RiskForecast],
-    by: str = "author"
+    by: str = "author",
+    as_of: Optional[datetime] = None,
 ) -> Dict[str, float]:
     """
     Aggregiert durchschnittliche Brier Scores nach einem Attribut
@@ -99,12 +154,16 @@ def aggregate_brier_scores(
 
     Aggregationen erfolgen ausschließlich über Prognosen,
     die die Voraussetzungen für eine quantitative Bewertung erfüllen.
+    as_of wirkt wie bei mean_brier_score (ebenfalls vollständiger
+    Durchlauf; für viele Stichtage AsOfIndex verwenden).
     """
+    if as_of is not None:
+        as_of = _naive_utc(as_of)
     scores: Dict[str, float] = {}
     counts: Dict[str, int] = {}
 
     for forecast in forecasts:
-        if not is_brier_applicable(forecast):
+        if not _scoreable(forecast, as_of):
             continue
 
         key = getattr(forecast, by, None)
@@ -121,3 +180,156 @@ def aggregate_brier_scores(
         for key in scores
         if counts[key] > 0
     }
+
+
+# --------------------------------
+# Stichtagsbezogene Auswertung
+# --------------------------------
+
+class AsOfIndex:
+    """
+    Sortierter Index über bewertete Prognosen zur Rekonstruktion von
+    Auswertungen zu beliebigen Stichtagen.
+
+    Jede zulässig bewertete Prognose wird nach known_as_of (spätester
+    von Prognose- und Bewertungszeitpunkt) sortiert abgelegt, zusammen
+    mit Präfixsummen der Brier Scores. Eine Abfrage benötigt damit nur
+    eine binäre Suche statt eines vollständigen Durchlaufs.
+    """
+
+    def __init__(self, forecasts: List[RiskForecast]):
+        self._forecasts = forecasts
+
+        entries = sorted(
+            (known, index)
+            for index, f in enumerate(forecasts)
+            if is_brier_applicable(f) and (known := known_as_of(f)) is not None
+        )
+        self._rows = [index for _, index in entries]
+        self._keys = [known for known, _ in entries]
+        self._prefix = self._prefix_sums(self._rows)
+        self._groups: Dict[str, Dict[str, Tuple[List[datetime], List[float]]]] = {}
+
+    def _prefix_sums(self, rows: List[int]) -> List[float]:
+        return list(accumulate(
+            (brier_score(self._forecasts[i].probability, self._forecasts[i].outcome)
+             for i in rows),
+            initial=0.0,
+        ))
+
+    def _group_index(self, by: str) -> Dict[str, Tuple[List[datetime], List[float]]]:
+        if by not in self._groups:
+            rows: Dict[str, List[int]] = {}
+            for index in sorted(self._rows):  # Gruppen in Erfassungsreihenfolge
+                key = getattr(self._forecasts[index], by, None)
+                if isinstance(key, str) and key.strip():
+                    rows.setdefault(key, []).append(index)
+
+            position = {index: pos for pos, index in enumerate(self._rows)}
+            groups = {}
+            for key, members in rows.items():
+                members.sort(key=position.__getitem__)
+                groups[key] = (
+                    [self._keys[position[i]] for i in members],
+                    self._prefix_sums(members),
+                )
+            self._groups[by] = groups
+        return self._groups[by]
+
+    def count(self, as_of: datetime) -> int:
+        """Anzahl bewerteter Prognosen zum Stichtag."""
+        return bisect_right(self._keys, _naive_utc(as_of))
+
+    def mean_brier_score(self, as_of: datetime) -> Optional[float]:
+        """Entspricht mean_brier_score(forecasts, as_of=as_of)."""
+        count = self.count(as_of)
+        if count == 0:
+            return None
+        return self._prefix[count] / count
+
+    def aggregate_brier_scores(
+        self,
+        as_of: datetime,
+        by: str = "author",
+    ) -> Dict[str, float]:
+        """Entspricht aggregate_brier_scores(forecasts, by, as_of=as_of)."""
+        as_of = _naive_utc(as_of)
+        result: Dict[str, float] = {}
+        for key, (keys, prefix) in self._group_index(by).items():
+            count = bisect_right(keys, as_of)
+            if count > 0:
+                result[key] = prefix[count] / count
+        return result
+
+
+# --------------------------------
+# Bewertung auf dem Spaltenspeicher
+# --------------------------------
+
+def brier_applicable_mask(columns: ColumnStore) -> np.ndarray:
+    """
+    Vektorisierte Entsprechung von is_brier_applicable über alle Zeilen
+    eines Spaltenspeichers.
+    """
+    return (
+        (columns.comparison_level == COMPARISON_LEVELS.index("E3"))
+        & (columns.forecast_type != FORECAST_TYPES.index("PT4"))
+        & (columns.outcome != MISSING_OUTCOME)
+        & ~np.isnan(columns.probability)
+        & ~(
+            (columns.outcome_class == OUTCOME_CLASSES.index("O2"))
+            & (columns.has_threshold == 0)
+        )
+    )
+
+
+def brier_scores_columns(columns: ColumnStore) -> np.ndarray:
+    """
+    Brier Scores aller Zeilen; nicht bewertbare Zeilen sind NaN.
+    """
+    mask = brier_applicable_mask(columns)
+    scores = (columns.probability - columns.outcome) ** 2
+    return np.where(mask, scores, np.nan)
+
+
+def mean_brier_score_columns(columns: ColumnStore) -> Optional[float]:
+    """
+    Entspricht mean_brier_score, berechnet jedoch direkt auf dem
+    Spaltenspeicher (ohne Rekonstruktion der Prognoseobjekte).
+    """
+    mask = brier_applicable_mask(columns)
+    count = int(np.count_nonzero(mask))
+    if count == 0:
+        return None
+
+    probability = columns.probability[mask]
+    outcome = columns.outcome[mask]
+    return float(np.sum((probability - outcome) ** 2) / count)
+
+
+def aggregate_brier_scores_columns(
+    columns: ColumnStore,
+    by: str = "author"
+) -> Dict[str, float]:
+    """
+    Entspricht aggregate_brier_scores für die Wörterbuchspalten
+    'author' und 'team' des Spaltenspeichers.
+    """
+    labels = columns.dictionaries.get(by)
+    if labels is None:
+        raise ValueError(f"Aggregation nach '{by}' wird nicht unterstützt.")
+
+    codes = columns.column(by)
+    mask = brier_applicable_mask(columns) & (codes != MISSING_CODE)
+    if not np.any(mask):
+        return {}
+
+    group = codes[mask]
+    scores = (columns.probability[mask] - columns.outcome[mask]) ** 2
+    sums = np.bincount(group, weights=scores, minlength=len(labels))
+    counts = np.bincount(group, minlength=len(labels))
+
+    return {
+        labels[code]: float(sums[code] / counts[code])
+        for code in np.flatnonzero(counts)
+    }
@@ -1,13 +1,36 @@
 import json
+import os
+import threading
 from pathlib import Path
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Dict, Tuple
 from datetime import datetime
 
+from columnar import ColumnStore, read_source_version, write_columns
 from models import RiskForecast
+from revisions import Revision, RevisionLog, open_log
+from schema import SCHEMA_VERSION, validate_json
 
 # Persistenter Speicher (lokale Datei)
 DATA_FILE = Path("forecasts.json")
 
+# Wiederverwendeter Encoder (json.dumps mit Optionen erzeugt je Aufruf einen neuen)
+_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+
+def columns_dir() -> Path:
+    """
+    Verzeichnis des spaltenorientierten Seitenspeichers (columnar.py)
+    neben der JSON-Datei.
+    """
+    return DATA_FILE.with_name(DATA_FILE.stem + "_columns")
+
+
+def revisions_file() -> Path:
+    """
+    Append-only-Revisionsprotokoll (revisions.py) neben der JSON-Datei.
+    """
+    return DATA_FILE.with_name(DATA_FILE.stem + "_revisions.jsonl")
+
 
 # Hilfsfunktionen
 def _serialize_datetime(value: Optional[datetime]) -> Optional[str]:
@@ -119,15 +142,27 @@ def dict_to_forecast(data: dict) -> RiskForecast:
 
 
 # Öffentliche API
-def load_forecasts() -> List[RiskForecast]:
+def load_forecasts(strict: bool = False) -> List[RiskForecast]:
     """
     Lädt alle gespeicherten Prognosen aus der persistenten JSON-Datei.
+
+    Mit strict=True wird die Datei gegen das Prognoseschema (schema.py)
+    validiert; Verstöße führen zu einer SchemaValidationError mit
+    Feldangaben, statt fehlende Felder mit Standardwerten zu füllen.
+
+    Gelesen werden versionierte Dateien ({"schema_version", "forecasts"})
+    ebenso wie ältere Dateien im reinen Listenformat.
     """
     if not DATA_FILE.exists():
         return []
 
+    if strict:
+        return validate_json(DATA_FILE.read_bytes())
+
     with DATA_FILE.open("r", encoding="utf-8") as f:
         raw_data = json.load(f)
+    if isinstance(raw_data, dict):
+        raw_data = raw_data.get("forecasts")
 
     # robust: falls Datei leer/kaputt ist, lieber nicht crashen
     if not isinstance(raw_data, list):
@@ -145,18 +180,187 @@ def save_forecast(forecast: RiskForecast) -> None:
     """
     forecasts = load_forecasts()
     forecasts.append(forecast)
-    save_all_forecasts(forecasts)
+    save_all_forecasts(forecasts, reason="create")
+
+
+def save_forecasts(new_forecasts: List[RiskForecast]) -> None:
+    """
+    Speichert mehrere neue Prognosen in einem einzigen Schreibvorgang.
+
+    Entspricht wiederholtem Aufruf von save_forecast, liest und schreibt
+    die Datei jedoch nur einmal (Batch-Ingest).
+    """
+    if not new_forecasts:
+        return
+    forecasts = load_forecasts()
+    forecasts.extend(new_forecasts)
+    save_all_forecasts(forecasts, reason="create")
+
+
+def apply_outcome(forecast: RiskForecast, outcome: int) -> RiskForecast:
+    """
+    Setzt den beobachteten Ereignisausgang einer Prognose (in-place).
+
+    Mit der Outcome-Erfassung wird die Prognose auf Vergleichsebene E3
+    gehoben und damit quantitativ bewertbar.
+    """
+    if outcome not in (0, 1):
+        raise ValueError("outcome muss 0 oder 1 sein.")
+    forecast.outcome = int(outcome)
+    forecast.evaluation_timestamp = datetime.utcnow()
+    forecast.comparison_level = "E3"
+    return forecast
+
+
+def update_outcomes(updates: Dict[str, int]) -> List[RiskForecast]:
+    """
+    Setzt Outcomes für mehrere Prognosen und speichert einmalig.
+
+    Unbekannte forecast_ids werden ignoriert; zurückgegeben werden
+    ausschließlich die tatsächlich aktualisierten Prognosen.
+    """
+    if not updates:
+        return []
+    forecasts = load_forecasts()
+    updated = [
+        apply_outcome(f, updates[f.forecast_id])
+        for f in forecasts
+        if f.forecast_id in updates
+    ]
+    if updated:
+        save_all_forecasts(forecasts, reason="outcome")
+    return updated
+
+
+def update_forecast(forecast: RiskForecast, *, reason: str) -> None:
+    """
+    Ersetzt den gespeicherten Stand einer Prognose (gleiche forecast_id),
+    z. B. nach normalize_time_horizon oder apply_threshold.
+
+    Der vorherige Stand bleibt über die Revisionshistorie erhalten.
+    """
+    forecasts = load_forecasts()
+    for position, existing in enumerate(forecasts):
+        if existing.forecast_id == forecast.forecast_id:
+            forecasts[position] = forecast
+            break
+    else:
+        raise KeyError(forecast.forecast_id)
+    save_all_forecasts(forecasts, reason=reason)
 
 
-def save_all_forecasts(forecasts: List[RiskForecast]) -> None:
+def data_version() -> Optional[Tuple[int, int]]:
+    """
+    Liefert eine Versionskennung des persistenten Datenbestands
+    (Änderungszeitpunkt und Dateigröße) oder None, falls noch keine
+    Datei existiert.
+    """
+    return _file_version(DATA_FILE)
+
+
+def _file_version(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def save_all_forecasts(
+    forecasts: List[RiskForecast],
+    reason: Optional[str] = None,
+) -> Optional[Tuple[int, int]]:
     """
     Speichert den vollständigen Systemzustand aller Prognosen.
     (z.B. nach Outcome-Setzung)
+
+    Neue und geänderte Prognosen werden zusätzlich als Revision
+    (Delta gegenüber der Vorversion) protokolliert; reason beschreibt
+    den Anlass der Änderung.
+
+    Reihenfolge: zuerst die Revision, dann die JSON-Datei (über eine
+    temporäre Datei atomar ersetzt), zuletzt der Spaltenspeicher. Ein
+    Abbruch hinterlässt so nie einen gespeicherten Stand ohne Revision.
+    Beides geschieht unter der Sperre des Revisionsprotokolls; schlägt
+    das Schreiben der JSON-Datei fehl, wird die Revision zurückgenommen.
+
+    Liefert die data_version der geschriebenen Datei. Sie wird vor dem
+    Ersetzen an der temporären Datei bestimmt (os.replace erhält
+    Änderungszeitpunkt und Größe); ein anschließend gelesenes
+    data_version() könnte bereits zu einem anderen Speichervorgang gehören.
+    """
+    records = [forecast_to_dict(f) for f in forecasts]
+
+    # eigene temporäre Datei je Thread, damit parallele Speichervorgänge
+    # sich nicht gegenseitig überschreiben
+    tmp_file = DATA_FILE.with_name(
+        f"{DATA_FILE.name}.{os.getpid()}-{threading.get_ident()}.tmp"
+    )
+    with _revision_log().pending(records, reason=reason):
+        with tmp_file.open("w", encoding="utf-8") as f:
+            _write_document(f, records)
+        version = _file_version(tmp_file)
+        os.replace(tmp_file, DATA_FILE)
+
+    # Spaltenspeicher für die Bewertung synchron halten
+    write_columns(columns_dir(), forecasts, source_version=version)
+    return version
+
+
+def _write_document(f, records: List[dict]) -> None:
+    """
+    Schreibt die versionierte Datei (schema.ForecastDocument) mit einem
+    Datensatz je Zeile. encode je Datensatz nutzt den C-Encoder;
+    json.dump (insbesondere mit indent) kodiert rein in Python und ist
+    bei großen Beständen um ein Vielfaches langsamer.
     """
-    with DATA_FILE.open("w", encoding="utf-8") as f:
-        json.dump(
-            [forecast_to_dict(f) for f in forecasts],
-            f,
-            indent=2,
-            ensure_ascii=False,
+    f.write(f'{{"schema_version": {json.dumps(SCHEMA_VERSION)}, "forecasts": [\n')
+    f.write(",\n".join(map(_ENCODER.encode, records)))
+    f.write("\n]}\n")
+
+
+def _revision_log() -> RevisionLog:
+    """
+    Öffnet das Revisionsprotokoll. Fehlt es bei bereits vorhandener
+    JSON-Datei, wird zuerst deren Stand als Keyframe (reason="baseline")
+    übernommen, damit die erste Änderung als Delta dagegen erscheint.
+    """
+    log = open_log(revisions_file())
+    if log.empty and DATA_FILE.exists():
+        log.record(
+            [forecast_to_dict(f) for f in load_forecasts()],
+            reason="baseline",
         )
+    return log
+
+
+def forecast_history(forecast_id: str) -> List[Revision]:
+    """
+    Liefert die Revisionen einer Prognose (älteste zuerst).
+    """
+    return _revision_log().history(forecast_id)
+
+
+def load_forecast_revision(
+    forecast_id: str,
+    revision: Optional[int] = None,
+) -> RiskForecast:
+    """
+    Rekonstruiert eine Prognose im Stand einer bestimmten Revision
+    (Standard: aktuelle Revision).
+    """
+    return dict_to_forecast(_revision_log().version(forecast_id, revision))
+
+
+def load_columns() -> ColumnStore:
+    """
+    Öffnet den Spaltenspeicher der bewertungsrelevanten Felder.
+
+    Ist er nicht vorhanden oder passt er nicht zur aktuellen JSON-Datei
+    (z. B. nach externer Änderung), wird er einmalig neu aufgebaut.
+    """
+    version = data_version()
+    directory = columns_dir()
+    if version is None or read_source_version(directory) != version:
+        write_columns(directory, load_forecasts(strict=True), source_version=version)
+    return ColumnStore(directory)
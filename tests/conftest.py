@@ -0,0 +1,44 @@
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Projektmodule liegen flach im Wurzelverzeichnis
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import revisions  # noqa: E402
+import storage  # noqa: E402
+from models import RiskForecast  # noqa: E402
+
+
+@pytest.fixture
+def data_file(tmp_path, monkeypatch):
+    """Leitet forecasts.json (samt Revisions- und Spaltenspeicher) nach tmp_path um."""
+    monkeypatch.setattr(storage, "DATA_FILE", tmp_path / "forecasts.json")
+    monkeypatch.setattr(revisions, "_logs", {})
+    return storage.DATA_FILE
+
+
+@pytest.fixture
+def make_forecast():
+    """
+    Fabrik für gültige Prognosen; jedes Feld lässt sich als
+    Schlüsselwort überschreiben.
+    """
+    def make(forecast_id="f1", **overrides):
+        values = dict(
+            forecast_id=forecast_id,
+            forecast_timestamp=datetime(2024, 1, 1),
+            forecast_type="PT1",
+            event_description="Ereignis",
+            event_criteria="Kriterium",
+            outcome_class="O1",
+            forecast_horizon_start=datetime(2024, 1, 1),
+            forecast_horizon_end=datetime(2024, 6, 30),
+            probability=0.3,
+            forecast_name="Prognose",
+        )
+        values.update(overrides)
+        return RiskForecast(**values)
+    return make
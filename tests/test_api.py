@@ -0,0 +1,206 @@
+import asyncio
+import json
+import time
+from datetime import datetime
+
+import pytest
+
+import api
+import storage
+
+
+async def _request(port, raw):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(raw)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    body = await reader.readexactly(length)
+    writer.close()
+    return status, json.loads(body)
+
+
+def _call(raws):
+    async def run():
+        server, service = await api.start_server(port=0, batch_window=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return [await _request(port, raw) for raw in raws]
+        finally:
+            server.close()
+            await service.stop()
+    return asyncio.run(run())
+
+
+def _get(path):
+    return f"GET {path} HTTP/1.1\r\nConnection: close\r\n\r\n".encode("latin-1")
+
+
+def test_as_of_with_utc_offset_matches_naive_utc(data_file, make_forecast):
+    storage.save_all_forecasts([
+        make_forecast("f1", probability=0.2, outcome=1, comparison_level="E3",
+                      evaluation_timestamp=datetime(2024, 7, 1, 10)),
+        make_forecast("f2", probability=0.2, outcome=0, comparison_level="E3",
+                      evaluation_timestamp=datetime(2024, 7, 1, 14)),
+    ])
+
+    [(status, offset), (_, naive), (_, zulu)] = _call([
+        _get("/scores?as_of=2024-07-01T12:00:00%2B02:00"),
+        _get("/scores?as_of=2024-07-01T10:00:00"),
+        _get("/scores?as_of=2024-07-01T10:00:00Z"),
+    ])
+
+    assert status == 200
+    assert offset["as_of"] == "2024-07-01T10:00:00"
+    assert offset["mean_brier_score"] == naive["mean_brier_score"] == pytest.approx(0.64)
+    assert zulu["mean_brier_score"] == naive["mean_brier_score"]
+
+
+def _post(path, payload):
+    body = json.dumps(payload).encode("utf-8")
+    return (
+        f"POST {path} HTTP/1.1\r\nConnection: close\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    ).encode("latin-1") + body
+
+
+def test_outcome_is_set_once_after_horizon(data_file, make_forecast):
+    storage.save_all_forecasts([
+        make_forecast("closed"),
+        make_forecast("open", forecast_horizon_end=datetime(2999, 1, 1)),
+    ])
+
+    responses = _call([
+        _post("/forecasts/closed/outcome", {"outcome": 1}),
+        _post("/forecasts/closed/outcome", {"outcome": 0}),
+        _post("/forecasts/open/outcome", {"outcome": 1}),
+        _post("/forecasts/missing/outcome", {"outcome": 1}),
+    ])
+
+    assert [status for status, _ in responses] == [200, 409, 409, 404]
+    assert responses[0][1]["comparison_level"] == "E3"
+    stored = {f.forecast_id: f for f in storage.load_forecasts()}
+    assert stored["closed"].outcome == 1
+    assert stored["open"].outcome is None
+
+
+def test_outcome_does_not_mutate_cached_forecast(data_file, make_forecast):
+    storage.save_all_forecasts([make_forecast("f1")])
+
+    async def run():
+        service = api.ForecastService(batch_window=0)
+        service.start()
+        try:
+            before = await service.get("f1")
+            updated = await service.submit("outcome", ("f1", 1))
+            return before, updated, await service.get("f1")
+        finally:
+            await service.stop()
+
+    before, updated, after = asyncio.run(run())
+    assert before.outcome is None and before.comparison_level == "E1"
+    assert updated is not before and after.outcome == 1
+
+
+def test_invalid_content_length_is_rejected(data_file):
+    [(status, body)] = _call([
+        b"POST /forecasts HTTP/1.1\r\nContent-Length: abc\r\n\r\n",
+    ])
+
+    assert status == 400
+    assert "Content-Length" in body["error"]
+
+
+async def _raw(port, raw):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(raw)
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    return data
+
+
+def _call_raw(raw):
+    async def run():
+        server, service = await api.start_server(port=0, batch_window=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await _raw(port, raw)
+        finally:
+            server.close()
+            await service.stop()
+    return asyncio.run(run())
+
+
+def test_chunked_request_body_is_rejected(data_file):
+    body = json.dumps({"outcome": 1}).encode()
+    smuggled = b"GET /forecasts HTTP/1.1\r\n\r\n"
+    response = _call_raw(
+        b"POST /forecasts HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n"
+        + b"%x\r\n%s\r\n0\r\n\r\n" % (len(body), body) + smuggled
+    )
+
+    assert response.startswith(b"HTTP/1.1 411 ")
+    assert response.count(b"HTTP/1.1") == 1
+
+
+def test_error_during_stream_closes_connection(data_file, monkeypatch, make_forecast):
+    storage.save_all_forecasts([make_forecast(f"f{i}") for i in range(5)])
+    monkeypatch.setattr(api, "STREAM_CHUNK_SIZE", 2)
+    calls = []
+
+    def failing_to_dict(forecast):
+        calls.append(forecast)
+        if len(calls) > 3:
+            raise RuntimeError("Abbruch")
+        return storage.forecast_to_dict(forecast)
+
+    monkeypatch.setattr(api, "forecast_to_dict", failing_to_dict)
+    response = _call_raw(_get("/forecasts"))
+
+    head, _, body = response.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 200 ")
+    assert b"HTTP/1.1 500" not in body
+    assert not body.endswith(b"0\r\n\r\n")
+
+
+def test_scoring_does_not_block_other_requests(data_file, monkeypatch, make_forecast):
+    storage.save_all_forecasts([make_forecast("f1")])
+
+    def slow_mean(forecasts):
+        time.sleep(0.5)
+        return None
+
+    monkeypatch.setattr(api, "mean_brier_score", slow_mean)
+
+    async def run():
+        server, service = await api.start_server(port=0, batch_window=0)
+        port = server.sockets[0].getsockname()[1]
+        done = {}
+
+        async def request(name, path):
+            status, _ = await _request(port, _get(path))
+            done[name] = time.perf_counter()
+            return status
+
+        try:
+            scores = asyncio.ensure_future(request("scores", "/scores"))
+            await asyncio.sleep(0.1)
+            status = await request("forecast", "/forecasts/f1")
+            await scores
+            return status, done
+        finally:
+            server.close()
+            await service.stop()
+
+    status, done = asyncio.run(run())
+    assert status == 200
+    # bei blockierter Event-Loop käme die zweite Anfrage erst danach an
+    assert done["forecast"] < done["scores"]
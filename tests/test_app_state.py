@@ -0,0 +1,56 @@
+from dataclasses import replace
+from datetime import datetime
+
+import storage
+from app_state import SharedState
+from benchmarks.datasets import make_forecasts
+from scoring import aggregate_brier_scores
+
+
+def test_outcome_is_set_once_and_aggregated(data_file, make_forecast):
+    storage.save_all_forecasts([
+        make_forecast("f1", author="A", probability=0.2),
+        make_forecast("f2", author="A", probability=0.7, outcome=1,
+                      comparison_level="E3", evaluation_timestamp=datetime(2024, 7, 1)),
+        make_forecast("f3", author="B", probability=0.9),
+    ])
+    shared = SharedState()
+
+    assert shared.set_outcome("f1", 1) is True
+    assert shared.set_outcome("f1", 0) is False
+    assert shared.set_outcome("f3", 0) is True
+
+    stored = storage.load_forecasts()
+    assert {f.forecast_id: f.outcome for f in stored} == {"f1": 1, "f2": 1, "f3": 0}
+    assert shared.aggregate_scores() == aggregate_brier_scores(stored)
+
+
+def test_reloads_after_write_by_other_process(data_file, make_forecast):
+    storage.save_all_forecasts([make_forecast("f1", author="A")])
+    shared = SharedState()
+    shared.create_forecast(make_forecast("f2", author="B"))
+    assert shared.get_state()["version"] == storage.data_version()
+
+    storage.update_outcomes({"f1": 1})
+
+    state = shared.get_state()
+    assert state["forecasts"][state["index"]["f1"]].outcome == 1
+    assert [f.forecast_id for f in state["forecasts"]] == ["f1", "f2"]
+
+
+def test_author_means_match_full_recomputation(data_file):
+    forecasts = make_forecasts(400, seed=3)
+    storage.save_all_forecasts(forecasts)
+    shared = SharedState()
+    open_ids = [f.forecast_id for f in forecasts if f.outcome is None]
+
+    for i, forecast_id in enumerate(open_ids[:60]):
+        shared.set_outcome(forecast_id, i % 2)
+    state = shared.get_state()
+    moved = state["forecasts"][state["index"][open_ids[0]]]
+    # Autorwechsel: beide Mittelwerte ändern sich
+    shared.write([replace(moved, author="neu")], reason="edit")
+
+    # bitgleich und in derselben Reihenfolge wie eine vollständige Neuberechnung
+    expected = aggregate_brier_scores(storage.load_forecasts())
+    assert list(shared.aggregate_scores().items()) == list(expected.items())
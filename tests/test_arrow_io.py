@@ -0,0 +1,112 @@
+from dataclasses import replace
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+import storage
+from arrow_io import (
+    CATEGORIES,
+    export_forecasts,
+    import_dataset,
+    iter_forecasts,
+    iter_record_batches,
+)
+from schema import SCHEMA_VERSION, SchemaValidationError
+
+
+@pytest.fixture
+def forecasts(make_forecast):
+    base = make_forecast(
+        "f0",
+        forecast_timestamp=datetime(2024, 1, 1, 8, 30, 0, 123456),
+        probability=0.25,
+    )
+    return [
+        # optionale Felder leer
+        base,
+        replace(
+            base, forecast_id="f1", forecast_type="PT3", outcome_class="O4",
+            comparison_level="E3", author="A", team="T", rationale="Begründung",
+            threshold_definition="≥ 3 Vorfälle", outcome=1,
+            evaluation_timestamp=datetime(2024, 7, 1, 12),
+        ),
+        replace(
+            base, forecast_id="f2", forecast_type="PT2", outcome_class="O3",
+            comparison_level="E2", normalization_applied=True,
+            normalization_assumption="Konstante Hazardrate", outcome=0,
+        ),
+    ]
+
+
+@pytest.mark.parametrize("fmt", ["arrow", "parquet"])
+def test_roundtrip_is_lossless(tmp_path, forecasts, fmt):
+    path = tmp_path / f"forecasts.{fmt}"
+
+    assert export_forecasts(path, forecasts, format=fmt, batch_size=2) == 3
+
+    read = list(iter_forecasts(path, format=fmt))
+    assert [storage.forecast_to_dict(f) for f in read] == [
+        storage.forecast_to_dict(f) for f in forecasts
+    ]
+    assert read[0].author is None and read[0].outcome is None
+    assert read[0].evaluation_timestamp is None
+
+
+@pytest.mark.parametrize("fmt", ["arrow", "parquet"])
+def test_categorical_columns_use_fixed_dictionaries(tmp_path, forecasts, fmt):
+    path = tmp_path / f"forecasts.{fmt}"
+    export_forecasts(path, forecasts, format=fmt)
+
+    [batch] = list(iter_record_batches(path, format=fmt))
+    for name, categories in CATEGORIES.items():
+        column = batch.column(name)
+        assert pa.types.is_dictionary(column.type)
+        assert column.dictionary.to_pylist() == list(categories)
+    assert batch.column("forecast_type").to_pylist() == ["PT1", "PT3", "PT2"]
+    assert batch.column("brier_applicable").to_pylist() == [False, True, False]
+    assert batch.column("brier_score").to_pylist() == [None, pytest.approx(0.5625), None]
+
+
+def test_parquet_keeps_schema_version(tmp_path, forecasts):
+    path = tmp_path / "forecasts.parquet"
+    export_forecasts(path, forecasts, format="parquet")
+
+    metadata = pq.read_schema(path).metadata
+    assert metadata[b"schema_version"] == SCHEMA_VERSION.encode()
+
+
+@pytest.mark.parametrize("fmt", ["arrow", "parquet"])
+def test_import_validates_every_batch(data_file, tmp_path, forecasts, fmt):
+    storage.save_all_forecasts(forecasts[:1])
+    invalid = forecasts + [replace(forecasts[0], forecast_id="f3", probability=1.5)]
+    path = tmp_path / f"forecasts.{fmt}"
+    export_forecasts(path, invalid, format=fmt, batch_size=2)
+
+    with pytest.raises(SchemaValidationError) as exc:
+        import_dataset(path, format=fmt)
+
+    assert [(e.index, e.field) for e in exc.value.errors] == [(3, "probability")]
+    assert [f.forecast_id for f in storage.load_forecasts()] == ["f0"]
+
+
+def test_import_merges_by_forecast_id(data_file, tmp_path, make_forecast):
+    stored = [make_forecast(f"f-{i}") for i in range(10)]
+    storage.save_all_forecasts(stored, reason="create")
+    path = tmp_path / "forecasts.parquet"
+    export_forecasts(path, [
+        replace(stored[2], probability=0.9),
+        make_forecast("neu"),
+        replace(stored[2], probability=0.7),
+    ])
+
+    assert import_dataset(path) == 3
+
+    loaded = {f.forecast_id: f for f in storage.load_forecasts()}
+    assert len(loaded) == 11
+    assert loaded["f-2"].probability == 0.7
+    assert [r.reason for r in storage.forecast_history("f-2")] == ["create", "import"]
+    assert [r.reason for r in storage.forecast_history("f-7")] == ["create"]
+    assert storage.load_forecast_revision("f-7").probability == loaded["f-7"].probability
+    assert [r.reason for r in storage.forecast_history("neu")] == ["import"]
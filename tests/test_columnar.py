@@ -0,0 +1,103 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+import scoring
+import storage
+from benchmarks.datasets import make_forecasts
+from columnar import ColumnStore, read_source_version, write_columns
+from scoring import (
+    aggregate_brier_scores_columns,
+    brier_applicable_mask,
+    mean_brier_score_columns,
+)
+
+
+def test_concurrent_writes_leave_a_consistent_store(tmp_path):
+    directory = tmp_path / "columns"
+    datasets = [make_forecasts(50 + 10 * i, seed=i) for i in range(8)]
+    errors = []
+
+    def write(forecasts):
+        try:
+            for _ in range(5):
+                write_columns(directory, forecasts)
+        except Exception as exc:  # pragma: no cover - nur zur Diagnose
+            errors.append(exc)
+
+    threads = [threading.Thread(target=write, args=(d,)) for d in datasets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    store = ColumnStore(directory)
+    assert len(store) == len(store.forecast_ids) == len(store.column("probability"))
+    assert not list(directory.glob("*.tmp"))
+
+
+@pytest.fixture
+def forecasts(make_forecast):
+    # Zufallsbestand plus Grenzfälle von is_brier_applicable
+    evaluated = dict(comparison_level="E3", outcome=1, author="A", team="T")
+    return make_forecasts(300, seed=7) + [
+        make_forecast("pt4", forecast_type="PT4", **evaluated),
+        make_forecast("o2", outcome_class="O2", **evaluated),
+        make_forecast("o2-schwelle", outcome_class="O2", threshold_definition="≥ 3", **evaluated),
+        make_forecast("ohne-p", **dict(evaluated, probability=None)),
+        make_forecast("e2", **dict(evaluated, comparison_level="E2")),
+        make_forecast("leer", **dict(evaluated, author=" ", team=None)),
+    ]
+
+
+def test_column_scoring_matches_object_scoring(tmp_path, forecasts):
+    write_columns(tmp_path / "columns", forecasts)
+    columns = ColumnStore(tmp_path / "columns")
+
+    assert brier_applicable_mask(columns).tolist() == [
+        scoring.is_brier_applicable(f) for f in forecasts
+    ]
+    assert mean_brier_score_columns(columns) == pytest.approx(
+        scoring.mean_brier_score(forecasts)
+    )
+    for by in ("author", "team"):
+        expected = scoring.aggregate_brier_scores(forecasts, by=by)
+        assert aggregate_brier_scores_columns(columns, by=by) == pytest.approx(expected)
+
+
+def test_load_columns_rebuilds_on_version_mismatch(data_file, forecasts):
+    storage.save_all_forecasts(forecasts[:10])
+    assert read_source_version(storage.columns_dir()) == storage.data_version()
+
+    # externe Änderung der JSON-Datei (z. B. anderer Prozess)
+    records = [storage.forecast_to_dict(f) for f in forecasts[:4]]
+    data_file.write_text(json.dumps(records), encoding="utf-8")
+    assert read_source_version(storage.columns_dir()) != storage.data_version()
+
+    columns = storage.load_columns()
+    assert len(columns) == 4
+    assert columns.forecast_ids == [f.forecast_id for f in forecasts[:4]]
+    assert read_source_version(storage.columns_dir()) == storage.data_version()
+
+
+def test_columns_carry_the_version_of_their_own_save(data_file, monkeypatch, forecasts):
+    replace_file = os.replace
+
+    def replace_then_foreign_save(src, dst):
+        replace_file(src, dst)
+        if Path(dst) == data_file:
+            # Speichervorgang eines anderen Threads landet direkt danach
+            data_file.write_text(
+                json.dumps([storage.forecast_to_dict(forecasts[0])]), encoding="utf-8"
+            )
+
+    monkeypatch.setattr(storage.os, "replace", replace_then_foreign_save)
+    version = storage.save_all_forecasts(forecasts[:10])
+    monkeypatch.setattr(storage.os, "replace", replace_file)
+
+    assert read_source_version(storage.columns_dir()) == version != storage.data_version()
+    assert len(storage.load_columns()) == 1
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from normalization import convert_probabilities, normalize_time_horizons
+
+
+START = datetime(2024, 1, 1)
+
+
+def test_convert_probabilities_constant_hazard():
+    converted = convert_probabilities([0.0, 0.5, 1.0], [180, 180, 180], 360)
+    assert converted == pytest.approx([0.0, 0.75, 1.0])
+
+
+def test_zero_length_horizon_does_not_block_batch(make_forecast):
+    result = normalize_time_horizons(
+        [
+            make_forecast("leer", probability=0.5, forecast_horizon_end=START),
+            make_forecast("halb", probability=0.5, forecast_horizon_end=START + timedelta(days=180)),
+        ],
+        reference_horizon_days=360,
+    )
+
+    assert result[0].probability == 0.5
+    assert "T = 0" in result[0].normalization_assumption
+    assert result[1].probability == pytest.approx(0.75)
+    assert result[0].forecast_horizon_end == START + timedelta(days=360)
+
+
+def test_caller_assumption_is_appended_to_hazard_text(make_forecast):
+    result = normalize_time_horizons(
+        [make_forecast(probability=0.2, forecast_horizon_end=START + timedelta(days=90))],
+        reference_horizon_days=365,
+        assumption="Portfolio Q1.",
+    )
+
+    text = result[0].normalization_assumption
+    assert "von 90 auf 365 Tage" in text
+    assert text.endswith("Portfolio Q1.")
@@ -0,0 +1,67 @@
+import pytest
+
+from benchmarks.datasets import make_forecasts
+from parallel_scoring import parallel_evaluate, parallel_scores
+from scoring import aggregate_brier_scores, mean_brier_score
+
+
+@pytest.fixture(scope="module")
+def forecasts():
+    return make_forecasts(2_000, seed=11)
+
+
+def _fingerprint(result):
+    return (
+        result.total.hex(),
+        result.count,
+        {
+            by: [(key, part.total.hex(), part.count) for key, part in parts.items()]
+            for by, parts in result.groups.items()
+        },
+    )
+
+
+def test_result_is_bit_identical_for_any_worker_count(forecasts):
+    results = [
+        parallel_evaluate(forecasts, by=("author", "team"), workers=workers,
+                          chunk_size=300, include_scores=True)
+        for workers in (1, 2, 3)
+    ]
+
+    assert results[0].count > 0
+    assert _fingerprint(results[1]) == _fingerprint(results[0])
+    assert _fingerprint(results[2]) == _fingerprint(results[0])
+    assert results[1].scores == results[2].scores == results[0].scores
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_empty_input(workers):
+    result = parallel_evaluate([], workers=workers)
+
+    assert result.count == 0 and result.mean() is None
+    assert result.group_means("author") == {}
+    assert parallel_scores([], workers=workers) == (None, {})
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_chunk_larger_than_input(forecasts, workers):
+    small = forecasts[:50]
+    whole = parallel_evaluate(small, workers=workers, chunk_size=len(small) + 1000)
+    single = parallel_evaluate(small, workers=1, chunk_size=len(small))
+
+    assert _fingerprint(whole) == _fingerprint(single)
+
+
+def test_invalid_chunk_size_is_rejected(forecasts):
+    with pytest.raises(ValueError):
+        parallel_evaluate(forecasts, chunk_size=0)
+
+
+@pytest.mark.parametrize("by", ["author", "team"])
+def test_matches_sequential_scoring(forecasts, by):
+    mean, groups = parallel_scores(forecasts, by=by, workers=2, chunk_size=300)
+    expected = aggregate_brier_scores(forecasts, by=by)
+
+    assert mean == pytest.approx(mean_brier_score(forecasts))
+    assert groups.keys() == expected.keys()
+    assert groups == pytest.approx(expected)
@@ -0,0 +1,103 @@
+import json
+import threading
+
+import pytest
+
+import revisions
+import storage
+
+
+def test_reader_skips_incomplete_line_without_touching_the_file(tmp_path, make_forecast):
+    path = tmp_path / "log.jsonl"
+    revisions.RevisionLog(path).record(
+        [storage.forecast_to_dict(make_forecast())], reason="create"
+    )
+    line = json.dumps({"id": "f1", "rev": 1, "ts": "2024-07-01T00:00:00",
+                       "reason": "edit", "delta": {"probability": 0.5}}) + "\n"
+    # anderer Prozess mitten im Anhängen
+    with path.open("ab") as f:
+        f.write(line[:20].encode())
+    torn = path.read_bytes()
+
+    reader = revisions.RevisionLog(path)
+    assert path.read_bytes() == torn
+    assert reader.revision_count("f1") == 1
+
+    with path.open("ab") as f:
+        f.write(line[20:].encode())
+    reader.refresh()
+    assert reader.version("f1")["probability"] == 0.5
+
+
+def test_writer_drops_line_left_by_aborted_writer(tmp_path, make_forecast):
+    path = tmp_path / "log.jsonl"
+    log = revisions.RevisionLog(path)
+    log.record([storage.forecast_to_dict(make_forecast())], reason="create")
+    with path.open("ab") as f:
+        f.write(b'{"id":"f1","rev":1,"ts":"2024-')
+
+    log.record([storage.forecast_to_dict(make_forecast(probability=0.5))], reason="edit")
+
+    assert [r.revision for r in revisions.RevisionLog(path).history("f1")] == [0, 1]
+    assert path.read_bytes().count(b"\n") == 2
+
+
+def test_existing_file_without_log_is_seeded_as_baseline(data_file, make_forecast):
+    data_file.write_text(
+        json.dumps([storage.forecast_to_dict(make_forecast())]), encoding="utf-8"
+    )
+
+    storage.update_forecast(make_forecast(probability=0.6), reason="edit")
+
+    history = storage.forecast_history("f1")
+    assert [(r.revision, r.reason, r.keyframe) for r in history] == [
+        (0, "baseline", True),
+        (1, "edit", False),
+    ]
+    assert history[1].changed_fields == ("probability",)
+    assert storage.load_forecast_revision("f1", 0).probability == 0.3
+
+
+def test_failed_save_takes_back_its_revision(data_file, monkeypatch, make_forecast):
+    storage.save_all_forecasts([make_forecast(), make_forecast("f2")], reason="create")
+    replace_file = storage.os.replace
+
+    def fail(*args, **kwargs):
+        raise OSError("Abbruch")
+
+    monkeypatch.setattr(storage.os, "replace", fail)
+    with pytest.raises(OSError):
+        storage.save_all_forecasts(
+            [make_forecast(probability=0.9), make_forecast("f2"), make_forecast("neu")],
+            reason="edit",
+        )
+    monkeypatch.setattr(storage.os, "replace", replace_file)
+
+    assert storage.load_forecasts()[0].probability == 0.3
+    assert [r.reason for r in storage.forecast_history("f1")] == ["create"]
+    assert storage.load_forecast_revision("f1").probability == 0.3
+    assert storage.forecast_history("neu") == []
+
+    storage.update_forecast(make_forecast("f2", probability=0.6), reason="threshold")
+    assert [r.reason for r in storage.forecast_history("f1")] == ["create"]
+    assert [r.reason for r in storage.forecast_history("f2")] == ["create", "threshold"]
+
+
+def test_concurrent_records_keep_revision_numbers_unique(tmp_path, make_forecast):
+    log = revisions.open_log(tmp_path / "log.jsonl")
+
+    def edit(thread_index):
+        for step in range(20):
+            log.record(
+                [storage.forecast_to_dict(make_forecast(probability=(thread_index * 20 + step) / 200))],
+                reason="edit",
+            )
+
+    threads = [threading.Thread(target=edit, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    numbers = [r.revision for r in revisions.RevisionLog(log.path).history("f1")]
+    assert numbers == list(range(len(numbers)))
@@ -0,0 +1,127 @@
+import json
+from datetime import datetime
+
+import pytest
+
+import storage
+from models import RiskForecast
+from schema import SCHEMA_VERSION, SchemaValidationError, validate_inputs
+
+
+def _payload(**overrides):
+    payload = {
+        "forecast_type": "PT1",
+        "outcome_class": "O1",
+        "event_description": "Ereignis",
+        "event_criteria": "Kriterium",
+        "forecast_horizon_start": "2024-01-01T00:00:00",
+        "forecast_horizon_end": "2024-06-30T00:00:00",
+        "probability": 0.3,
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_aware_timestamps_are_stored_as_naive_utc():
+    [forecast] = validate_inputs([_payload(
+        forecast_horizon_start="2024-01-01T00:00:00Z",
+        forecast_horizon_end="2024-06-30T02:00:00+02:00",
+    )])
+
+    assert forecast.forecast_horizon_start == datetime(2024, 1, 1)
+    assert forecast.forecast_horizon_end == datetime(2024, 6, 30)
+    assert forecast.forecast_horizon_end.tzinfo is None
+
+
+def test_mixed_aware_and_naive_timestamps_are_comparable():
+    [forecast] = validate_inputs([_payload(
+        forecast_horizon_start="2024-01-01T00:00:00Z",
+        forecast_horizon_end="2024-06-30T00:00:00",
+    )])
+    assert forecast.forecast_horizon_start.tzinfo is None
+
+
+def test_horizon_order_is_a_field_error():
+    with pytest.raises(SchemaValidationError) as excinfo:
+        validate_inputs([_payload(
+            forecast_horizon_start="2024-06-30T00:00:00Z",
+            forecast_horizon_end="2024-01-01T00:00:00",
+        )])
+    [error] = excinfo.value.errors
+    assert (error.index, error.field) == (0, "forecast_horizon_end")
+
+
+def test_saved_file_carries_schema_version(data_file):
+    storage.save_all_forecasts(validate_inputs([_payload()]))
+
+    saved = json.loads(data_file.read_text(encoding="utf-8"))
+    assert saved["schema_version"] == SCHEMA_VERSION
+    assert len(saved["forecasts"]) == 1
+    assert len(storage.load_forecasts(strict=True)) == 1
+    assert len(storage.load_forecasts()) == 1
+
+
+def test_strict_load_accepts_legacy_list(data_file):
+    records = [storage.forecast_to_dict(f) for f in validate_inputs([_payload()])]
+    data_file.write_text(json.dumps(records), encoding="utf-8")
+
+    assert len(storage.load_forecasts(strict=True)) == 1
+
+
+def test_strict_load_rejects_unknown_version_and_reports_record_index(data_file):
+    records = [storage.forecast_to_dict(f) for f in validate_inputs([_payload()] * 2)]
+    data_file.write_text(json.dumps({"schema_version": "9.9", "forecasts": records}))
+    with pytest.raises(SchemaValidationError) as excinfo:
+        storage.load_forecasts(strict=True)
+    assert [e.field for e in excinfo.value.errors] == ["schema_version"]
+
+    records[1]["probability"] = 2.0
+    data_file.write_text(json.dumps({"schema_version": SCHEMA_VERSION, "forecasts": records}))
+    with pytest.raises(SchemaValidationError) as excinfo:
+        storage.load_forecasts(strict=True)
+    assert [(e.index, e.field) for e in excinfo.value.errors] == [(1, "probability")]
+
+
+def test_inputs_are_completed_like_create():
+    payloads = [
+        _payload(event_description="  Ereignis  ", author=" ", forecast_name=None),
+        _payload(normalization_applied=True, forecast_name=" Name ", team=" T "),
+    ]
+    plain, normalized = validate_inputs(payloads)
+
+    assert type(plain) is RiskForecast
+    assert plain.event_description == "Ereignis"
+    assert plain.author is None and plain.forecast_name == "Unbenannte Prognose"
+    assert (plain.comparison_level, plain.outcome, plain.evaluation_timestamp) == ("E1", None, None)
+    assert normalized.comparison_level == "E2"
+    assert (normalized.forecast_name, normalized.team) == ("Name", "T")
+    assert plain.forecast_id != normalized.forecast_id
+
+    with pytest.raises(SchemaValidationError) as excinfo:
+        validate_inputs([_payload(forecast_id="vorgegeben", probability="0.3")])
+    assert {e.field for e in excinfo.value.errors} == {"forecast_id", "probability"}
+
+
+def test_strict_load_migrates_legacy_records(data_file):
+    legacy = {
+        "forecast_id": "alt",
+        "forecast_title": "Alte Prognose",
+        "event_description": "Ereignis",
+        "event_criteria": "Kriterium",
+        "forecast_timestamp": "2023-01-01T00:00:00",
+        "forecast_horizon_start": "2023-01-01T00:00:00",
+        "forecast_horizon_end": "2023-06-30T00:00:00",
+        "probability": 0.4,
+    }
+    data_file.write_text(json.dumps([legacy]), encoding="utf-8")
+
+    [strict] = storage.load_forecasts(strict=True)
+    assert strict == storage.load_forecasts()[0]
+    assert strict.forecast_name == "Alte Prognose"
+    assert (strict.forecast_type, strict.comparison_level) == ("PT1", "E1")
+
+    del legacy["probability"]
+    data_file.write_text(json.dumps([legacy]), encoding="utf-8")
+    with pytest.raises(SchemaValidationError) as excinfo:
+        storage.load_forecasts(strict=True)
+    assert [(e.index, e.field) for e in excinfo.value.errors] == [(0, "probability")]
@@ -0,0 +1,28 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from scoring import AsOfIndex, aggregate_brier_scores, mean_brier_score
+
+
+@pytest.fixture
+def forecasts(make_forecast):
+    return [
+        make_forecast("f1", probability=0.2, outcome=1, author="A", comparison_level="E3",
+                      evaluation_timestamp=datetime(2024, 7, 1, 10)),
+        make_forecast("f2", probability=0.9, outcome=1, author="B", comparison_level="E3",
+                      evaluation_timestamp=datetime(2024, 7, 1, 14)),
+    ]
+
+
+@pytest.mark.parametrize("as_of", [
+    datetime(2024, 7, 1, 12, tzinfo=timezone(timedelta(hours=2))),
+    datetime(2024, 7, 1, 10, tzinfo=timezone.utc),
+])
+def test_aware_as_of_is_compared_in_utc(forecasts, as_of):
+    index = AsOfIndex(forecasts)
+
+    assert mean_brier_score(forecasts, as_of=as_of) == pytest.approx(0.64)
+    assert index.mean_brier_score(as_of) == pytest.approx(0.64)
+    assert aggregate_brier_scores(forecasts, as_of=as_of) == index.aggregate_brier_scores(as_of)
+    assert index.count(as_of) == 1